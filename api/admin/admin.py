@@ -0,0 +1,135 @@
+import json
+import logging
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.params import Security
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import JSONResponse, StreamingResponse
+
+from config import config
+from core.authentication.authorization import oauth_schema, authorize_admin
+from models.user import Role
+from sql.database import AsyncSessionLocal, create_async_connection
+from sql.repository import user_repository
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["admin"]
+)
+
+log = logging.getLogger(__name__)
+
+PAGE_LIMIT = (config.get('admin') or {}).get('page_limit', 1000)
+STREAM_BATCH_SIZE = (config.get('admin') or {}).get('stream_batch_size', 1000)
+
+def get_admin(authorization: str = Depends(oauth_schema)) -> dict:
+    return authorize_admin(authorization)
+
+def _listed_user(row) -> dict:
+    return {
+        "uid": row.uid,
+        "uname": row.uname,
+        "email": row.email,
+        "email_verified": row.email_verified,
+        "role": row.role.value,
+        "sex": row.sex,
+        "join_date": row.join_date.isoformat() if row.join_date is not None else None,
+        "last_login": row.last_login.isoformat() if row.last_login is not None else None
+    }
+
+async def _stream_ndjson(statement):
+    # the request's session is closed before a streamed body is sent, so the cursor gets its own
+    exported = 0
+    async with AsyncSessionLocal() as db:
+        async for rows in user_repository.stream_users(db, statement, STREAM_BATCH_SIZE):
+            exported += len(rows)
+            yield "".join(json.dumps(_listed_user(row), separators=(',', ':')) + "\n" for row in rows)
+    log.info("Streamed user listing. users=\"%s\"", exported)
+
+@router.get(
+    path="/users",
+    summary="List users",
+    description="List users ordered by uid. Pages are keyset paginated: pass the next value of a page as after to get the following page. With format=ndjson every matching user after the given uid is streamed as one JSON object per line, for full exports.",
+    responses={
+        200: {
+            "description": "A page of users, or every matching user as NDJSON",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 200,
+                        "state": "OK",
+                        "users": [
+                            {
+                                "uid": 1,
+                                "uname": "Kim",
+                                "email": "kim@example.com",
+                                "email_verified": True,
+                                "role": "USER",
+                                "sex": "N",
+                                "join_date": "2024-01-01T00:00:00",
+                                "last_login": "2024-02-01T00:00:00"
+                            }
+                        ],
+                        "next": 1
+                    }
+                },
+                "application/x-ndjson": {
+                    "example": "{\"uid\":1,\"uname\":\"Kim\",\"email\":\"kim@example.com\",\"email_verified\":true,\"role\":\"USER\",\"sex\":\"N\",\"join_date\":\"2024-01-01T00:00:00\",\"last_login\":null}\n"
+                }
+            }
+        },
+        401: {
+            "description": "Invalid JWT token",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 401,
+                        "state": "Unauthorized",
+                        "message": "You are not authorized to access this resource"
+                    }
+                }
+            }
+        },
+        403: {
+            "description": "JWT does not grant admin access",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 403,
+                        "state": "Forbidden",
+                        "message": "Admin access is required"
+                    }
+                }
+            }
+        }
+    }
+)
+async def list_users(
+    after: Optional[int] = Query(None, description="only users with a greater uid, the next value of the previous page"),
+    limit: int = Query(100, ge=1, le=PAGE_LIMIT, description="users per page, ignored when streaming"),
+    role: Optional[Role] = Query(None),
+    email_verified: Optional[bool] = Query(None),
+    joined_after: Optional[datetime] = Query(None, description="inclusive lower bound of join_date"),
+    joined_before: Optional[datetime] = Query(None, description="exclusive upper bound of join_date"),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    admin: dict = Security(get_admin),
+    db: AsyncSession = Depends(create_async_connection)
+):
+    statement = user_repository.listing(after, role, email_verified, joined_after, joined_before)
+
+    if format == "ndjson":
+        log.info("Streaming user listing. admin_uid=\"%s\", after=\"%s\"", admin.get("sub"), after)
+        return StreamingResponse(_stream_ndjson(statement), media_type="application/x-ndjson")
+
+    rows = await user_repository.list_users(db, statement, limit)
+    log.debug("Listed users. admin_uid=\"%s\", after=\"%s\", count=\"%s\"", admin.get("sub"), after, len(rows))
+    return JSONResponse(
+        content={
+            "code": 200,
+            "state": "OK",
+            "users": [_listed_user(row) for row in rows],
+            "next": rows[-1].uid if len(rows) == limit else None
+        }
+    )
@@ -1,13 +1,13 @@
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter
 from fastapi.params import Security
 from starlette.responses import JSONResponse
 
-from api.authentication.google_signin import router
-from core.authentication.authorization import oauth_schema, authorize_jwt
+from core.authentication.authorization import oauth_schema, authorize_jwt, verify_jwt
+from schemas.request_models.auth_requests import BatchAuthorizationRequest
 
-route = APIRouter(
+router = APIRouter(
     prefix="/api/auth",
     tags=["authentication"],
 )
@@ -73,8 +73,8 @@ log = logging.getLogger(__name__)
         }
     }
 )
-def authorize_user(auth: str = Security(oauth_schema)):
-    log.debug("Authorizing user with JWT token. jwt: {token}".format(token = auth))
+async def authorize_user(auth: str = Security(oauth_schema)):
+    log.debug("Authorizing user with JWT token. jwt: %s", auth)
     authorize_jwt(auth)
 
     return JSONResponse(
@@ -85,3 +85,65 @@ def authorize_user(auth: str = Security(oauth_schema)):
             "authorized": True
         }
     )
+
+@router.post(
+    path = "/authorization/batch",
+    summary = "Authorize many JWT tokens at once",
+    description = "Check a batch of JWT tokens in one request, for gateways that would otherwise call /api/auth/authorization once per upstream request. Tokens are passed without the Bearer prefix. Results are returned in the order of the tokens with the claims of every authorized token. Invalid, expired or revoked tokens are reported per token and do not fail the batch.",
+    responses = {
+        200: {
+            "description": "Verdict for every token",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 200,
+                        "state": "OK",
+                        "results": [
+                            {
+                                "authorized": True,
+                                "claims": {
+                                    "sub": 1,
+                                    "aud": ["with:user"],
+                                    "exp": 1729000000
+                                }
+                            },
+                            {
+                                "authorized": False
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        400: {
+            "description": "No tokens or more tokens than the batch limit were passed"
+        }
+    }
+)
+async def authorize_batch(body: BatchAuthorizationRequest):
+    results = []
+    for token in body.tokens:
+        try:
+            claims = verify_jwt(token)
+        except Exception:
+            results.append({"authorized": False})
+            continue
+
+        results.append({
+            "authorized": True,
+            "claims": {
+                "sub": claims.get("sub"),
+                "aud": claims.get("aud"),
+                "exp": claims.get("exp")
+            }
+        })
+
+    log.debug("Authorized batch of JWT tokens. tokens=\"%s\", authorized=\"%s\"", len(results), sum(result["authorized"] for result in results))
+    return JSONResponse(
+        status_code=200,
+        content={
+            "code": 200,
+            "state": "OK",
+            "results": results
+        }
+    )
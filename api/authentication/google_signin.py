@@ -1,13 +1,13 @@
 import logging
 
 from fastapi import APIRouter, Request, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import RedirectResponse
 
 from config import config
-from core.cryptography import aes256
-from core.google.oauth import start_authentication, complete_oauth_flow
-from sql.database import create_connection
+from core import providers
+from core.cryptography import oauth_state
+from sql.database import create_async_connection
 
 log = logging.getLogger(__name__)
 
@@ -35,18 +35,19 @@ router = APIRouter(
         }
     }
 )
-def start_signin_google():
+async def start_signin_google():
     log.info("Redirecting to Google OAuth signin")
-    auth_url, state = start_authentication()
+    auth_url, state = providers.get("google.oauth").start_authentication()
 
-    e_state = aes256.encrypt(state)
-    log.debug("Generated state value. state=\"{state}\", estate=\"{estate}\"".format(state=state, estate=e_state))
+    signed_state = oauth_state.sign(state)
+    log.debug("Generated state value. state=\"%s\", signed_state=\"%s\"", state, signed_state)
 
     response = RedirectResponse(auth_url, 302)
-    log.debug("Sent 302 Redirect. url=\"{url}\"".format(url=auth_url))
+    log.debug("Sent 302 Redirect. url=\"%s\"", auth_url)
     response.set_cookie(
         key="with-state",
-        value=e_state,
+        value=signed_state,
+        max_age=oauth_state.STATE_TTL,
         httponly=True,
         secure=config['env'] == "production",
         samesite="lax",
@@ -74,26 +75,24 @@ def start_signin_google():
         }
     }
 )
-def callback_signin_google(request: Request, db: Session = Depends(create_connection)):
+async def callback_signin_google(request: Request, db: AsyncSession = Depends(create_async_connection)):
     log.info("Handling Google OAuth2 Callback")
 
     if request.query_params.get("error"):
-        log.error("Google OAuth2 signin returned an error. error=\"{error}\"".format(error=request.query_params.get("error")))
+        log.error("Google OAuth2 signin returned an error. error=\"%s\"", request.query_params.get("error"))
         return RedirectResponse("/auth/signin?error=google_error", 302)
 
     # check state
-    e_cookie_state = request.cookies.get("with-state")
+    signed_state = request.cookies.get("with-state")
     response_state = request.query_params.get("state")
-    log.debug("Checking state cookie and callback. cookie_state=\"{cookie_state}\", callback_state=\"{response_state}\"".format(cookie_state=e_cookie_state, response_state=response_state))
+    log.debug("Checking state cookie and callback. cookie_state=\"%s\", callback_state=\"%s\"", signed_state, response_state)
 
-    if e_cookie_state is None or response_state is None:
+    if signed_state is None or response_state is None:
         log.error("Callback or Cookie State is unset")
         return RedirectResponse("/auth/signin?error=state_unset", 302)
 
-    cookie_state = aes256.decrypt(e_cookie_state)
-    log.debug("Decrypted cookie state. cookie_state=\"{cookie_state}\", callback_state=\"{response_state}\"".format(cookie_state=cookie_state, response_state=response_state))
-    if cookie_state is None or cookie_state != response_state:
-        log.error("States from cookie and callback does not match")
+    if not oauth_state.verify(signed_state, response_state):
+        log.error("State cookie is invalid, expired or does not match the callback")
         return RedirectResponse("/auth/signin?error=state_mismatch", 302)
 
     # check code
@@ -103,14 +102,14 @@ def callback_signin_google(request: Request, db: Session = Depends(create_connec
         return RedirectResponse("/auth/signin?error=code_unset", 302)
 
     try:
-        log.debug("Complete Google OAuth flow. oauth2_code=\"{code}\"".format(code=code))
-        jwt = complete_oauth_flow(code, db)
-        db.commit()
+        log.debug("Complete Google OAuth flow. oauth2_code=\"%s\"", code)
+        jwt = await providers.get("google.oauth").complete_oauth_flow(code, db)
+        await db.commit()
     except Exception as e:
-        log.error("Internal Server Error: {error}".format(error=str(e)), exc_info=e)
+        log.error("Internal Server Error: %s", e, exc_info=e)
         return RedirectResponse("/auth/signin?error=internal_server_error", 302)
 
-    log.debug("Redirecting to frontend with JWT token. jwt=\"{jwt}\"".format(jwt=jwt))
+    log.debug("Redirecting to frontend with JWT token. jwt=\"%s\"", jwt)
     response = RedirectResponse("/auth/signin/complete?jwt={jwt}".format(jwt=jwt), 302)
     response.delete_cookie('with-state')
 
@@ -0,0 +1,60 @@
+import hashlib
+from functools import lru_cache
+
+from fastapi import APIRouter, Request
+from starlette.responses import Response
+
+from config import config
+from core.jwt import keys
+
+router = APIRouter(
+    prefix="/.well-known",
+    tags=["authentication"],
+)
+
+JWKS_MAX_AGE = config['security'].get('jwks_max_age', 300)
+
+@lru_cache(maxsize=1)
+def _jwks_etag() -> str:
+    return '"{}"'.format(hashlib.sha256(keys.jwks()).hexdigest()[:32])
+
+@router.get(
+    path="/jwks.json",
+    summary="Get public keys for JWT verification",
+    description="Get the JSON Web Key Set of every key that signed or may sign access tokens. Resource servers verify tokens locally by matching the kid header against this set. The response may be cached for the time given in Cache-Control.",
+    responses={
+        200: {
+            "description": "JSON Web Key Set",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "keys": [
+                            {
+                                "kty": "EC",
+                                "crv": "P-256",
+                                "x": "f83OJ3D2xF1Bg8vub9tLe1gHMzV76e8Tus9uPHvRVEU",
+                                "y": "x_FEzRu9m36HLN_tue659LNpXW6pCyStikYjKIWI5a0",
+                                "kid": "2024-10",
+                                "alg": "ES256",
+                                "use": "sig"
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        304: {
+            "description": "Key set has not changed since the ETag in If-None-Match"
+        }
+    }
+)
+async def get_jwks(request: Request):
+    etag = _jwks_etag()
+    headers = {
+        "Cache-Control": "public, max-age={}".format(JWKS_MAX_AGE),
+        "ETag": etag
+    }
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=keys.jwks(), media_type="application/json", headers=headers)
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Request, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import RedirectResponse
 
 from config import config
-from core.cryptography import aes256
-from core.kakao.oauth import start_authentication, complete_oauth_flow
-from sql.database import create_connection
+from core import providers
+from core.cryptography import oauth_state
+from sql.database import create_async_connection
 
 router = APIRouter(
     prefix="/api/auth",
@@ -31,15 +31,16 @@ router = APIRouter(
         }
     }
 )
-def start_signin_kakao():
-    auth_url, state = start_authentication()
+async def start_signin_kakao():
+    auth_url, state = providers.get("kakao.oauth").start_authentication()
 
-    e_state = aes256.encrypt(state)
+    signed_state = oauth_state.sign(state)
 
     response = RedirectResponse(auth_url, 302)
     response.set_cookie(
         key="with-state",
-        value=e_state,
+        value=signed_state,
+        max_age=oauth_state.STATE_TTL,
         httponly=True,
         secure=config['env'] == "production",
         samesite="strict",
@@ -67,17 +68,16 @@ def start_signin_kakao():
         }
     }
 )
-def callback_signin_kakao(request: Request, db: Session = Depends(create_connection)):
+async def callback_signin_kakao(request: Request, db: AsyncSession = Depends(create_async_connection)):
     if request.query_params.get("error"):
         return RedirectResponse("/auth/signin?error=kakao_error", 302)
 
     # check state
-    e_cookie_state = request.cookies.get("with-state")
+    signed_state = request.cookies.get("with-state")
     response_state = request.query_params.get("state")
-    if e_cookie_state is None or response_state is None:
+    if signed_state is None or response_state is None:
         return RedirectResponse("/auth/signin?error=state_unset", 302)
-    cookie_state = aes256.decrypt(e_cookie_state)
-    if cookie_state is None or cookie_state != response_state:
+    if not oauth_state.verify(signed_state, response_state):
         return RedirectResponse("/auth/signin?error=state_mismatch", 302)
 
     # check code
@@ -85,8 +85,8 @@ def callback_signin_kakao(request: Request, db: Session = Depends(create_connect
     if code is None:
         return RedirectResponse("/auth/signin?error=code_unset", 302)
 
-    jwt = complete_oauth_flow(code, db)
-    db.commit()
+    jwt = await providers.get("kakao.oauth").complete_oauth_flow(code, db)
+    await db.commit()
 
     response = RedirectResponse("/auth/signin/complete?jwt={jwt}".format(jwt=jwt), 302)
     response.delete_cookie('with-state')
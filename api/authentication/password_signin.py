@@ -1,15 +1,15 @@
 import logging
 
 from fastapi import APIRouter, Request, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import JSONResponse
 
 from core import password
-from core.google.recaptcha import verify_recaptcha
+from core import providers
 from core.jwt import jwt
 from schemas.request_models.auth_requests import PasswordSignInRequest
 from schemas.user import UserSchema
-from sql.database import create_connection
+from sql.database import create_async_connection
 
 log = logging.getLogger(__name__)
 
@@ -77,12 +77,12 @@ router = APIRouter(
         }
     }
 )
-def signin_password(user_body: PasswordSignInRequest, request: Request, db: Session = Depends(create_connection)):
-    log.info("Signin with password. id=\"{}\"".format(user_body.id))
-    recaptcha = verify_recaptcha(user_body.recaptcha, request.client.host, "signin_password")
+async def signin_password(user_body: PasswordSignInRequest, request: Request, db: AsyncSession = Depends(create_async_connection)):
+    log.info("Signin with password. id=\"%s\"", user_body.id)
+    recaptcha = await providers.get("google.recaptcha").verify_recaptcha(user_body.recaptcha, request.client.host, "signin_password")
 
     if not recaptcha:
-        log.debug("Recaptcha verification failed and signin was canceled. user_id=\"{}\"".format(user_body.id))
+        log.debug("Recaptcha verification failed and signin was canceled. user_id=\"%s\"", user_body.id)
         return JSONResponse(
             content={
                 "code": 400,
@@ -92,10 +92,10 @@ def signin_password(user_body: PasswordSignInRequest, request: Request, db: Sess
             status_code=400
         )
 
-    user: UserSchema = password.user_service.authenticate_user(user_body.id, user_body.password, db)
+    user: UserSchema = await password.user_service.authenticate_user(user_body.id, user_body.password, db)
     jwt_token = jwt.create_token(user.uid, user.role)
 
-    db.commit()
+    await db.commit()
     return JSONResponse(
         content={
             "code": 200,
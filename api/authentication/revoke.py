@@ -0,0 +1,88 @@
+import logging
+
+from fastapi import APIRouter, Depends
+from fastapi.params import Security
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import JSONResponse
+
+from core import revocation
+from core.authentication.authorization import oauth_schema, authorize_jwt
+from sql.database import create_async_connection
+
+router = APIRouter(
+    prefix="/api/auth",
+    tags=["authentication"],
+)
+
+log = logging.getLogger(__name__)
+
+@router.post(
+    path="/revoke",
+    summary="Revoke the JWT token",
+    description="Revoke the JWT token sent in the Authorization header, for example on sign out. Every later request with this token is rejected with 401. Other server processes pick the revocation up within their refresh interval.",
+    responses={
+        200: {
+            "description": "JWT was revoked",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 200,
+                        "state": "OK",
+                        "revoked": True
+                    }
+                }
+            }
+        },
+        400: {
+            "description": "JWT was issued without an id and cannot be revoked",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 400,
+                        "state": "Bad Request",
+                        "message": "JWT cannot be revoked"
+                    }
+                }
+            }
+        },
+        401: {
+            "description": "JWT is invalid or already revoked",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 401,
+                        "state": "Unauthorized",
+                        "message": "JWT is invalid or unauthorized"
+                    }
+                }
+            }
+        }
+    }
+)
+async def revoke_token(auth: str = Security(oauth_schema), db: AsyncSession = Depends(create_async_connection)):
+    claims = authorize_jwt(auth)
+
+    if claims.get("jti") is None:
+        log.debug("JWT without jti cannot be revoked. sub=\"%s\"", claims.get("sub"))
+        return JSONResponse(
+            status_code=400,
+            content={
+                "code": 400,
+                "state": "Bad Request",
+                "message": "JWT cannot be revoked"
+            }
+        )
+
+    await revocation.revoke(db, claims)
+    await db.commit()
+    revocation.remember_revoked(claims)
+    log.info("Revoked JWT. sub=\"%s\", jti=\"%s\"", claims.get("sub"), claims.get("jti"))
+
+    return JSONResponse(
+        status_code=200,
+        content={
+            "code": 200,
+            "state": "OK",
+            "revoked": True
+        }
+    )
@@ -7,6 +7,7 @@ from pydantic import ValidationError
 from starlette.responses import JSONResponse
 from starlette.status import HTTP_404_NOT_FOUND, HTTP_500_INTERNAL_SERVER_ERROR
 
+from core.cryptography.password_engine import PasswordEngineBusy
 from core.password.user_service import AuthError
 
 log = logging.getLogger(__name__)
@@ -37,7 +38,7 @@ HTTP_CODE_TO_STATE = {
 }
 
 def http_exception_handler(request: Request, exc: HTTPException):
-    log.error("HTTPException: status_code={}, detail={}".format(exc.status_code, exc.detail))
+    log.error("HTTPException: status_code=%s, detail=%s", exc.status_code, exc.detail)
     response = JSONResponse(
         status_code=exc.status_code,
         content={
@@ -53,7 +54,7 @@ def http_exception_handler(request: Request, exc: HTTPException):
     return response
 
 def http_value_error_handler(request: Request, exc: ValueError):
-    log.error("ValueError: {}".format(exc))
+    log.error("ValueError: %s", exc)
     return JSONResponse(
         status_code=400,
         content={
@@ -64,7 +65,7 @@ def http_value_error_handler(request: Request, exc: ValueError):
     )
 
 def http_unauthorized_handler(request: Request, exc):
-    log.warning("Unauthorized: {}".format(exc))
+    log.warning("Unauthorized: %s", exc)
     return JSONResponse(
         status_code=401,
         headers={"WWW-Authenticate": "Bearer"},
@@ -76,7 +77,7 @@ def http_unauthorized_handler(request: Request, exc):
     )
 
 def http_validation_error_handler(request: Request, exc: ValueError):
-    log.error("ValidationError: {}".format(exc))
+    log.error("ValidationError: %s", exc)
     return JSONResponse(
         status_code=400,
         content={
@@ -87,7 +88,7 @@ def http_validation_error_handler(request: Request, exc: ValueError):
     )
 
 def http_request_validation_error_handler(request: Request, exc: RequestValidationError):
-    log.warning("RequestValidationError: {}".format(exc))
+    log.warning("RequestValidationError: %s", exc)
     errors = {
         err['loc'][-1]: err['msg'] for err in exc.errors()
     }
@@ -102,7 +103,7 @@ def http_request_validation_error_handler(request: Request, exc: RequestValidati
     )
 
 def http_internal_server_error_handler(request: Request, exc):
-    log.error("Internal Server Error: {}".format(exc))
+    log.error("Internal Server Error: %s", exc)
     return JSONResponse(
         status_code=500,
         content={
@@ -113,7 +114,7 @@ def http_internal_server_error_handler(request: Request, exc):
     )
 
 def http_not_found_handler(request: Request, exc):
-    log.warning("Not Found: {}".format(exc))
+    log.warning("Not Found: %s", exc)
     return JSONResponse(
         status_code=404,
         content={
@@ -124,7 +125,7 @@ def http_not_found_handler(request: Request, exc):
     )
 
 def http_auth_error_handler(request: Request, exc):
-    log.error("AuthError: {}".format(exc))
+    log.error("AuthError: %s", exc)
     return JSONResponse(
         status_code=200,
         content={
@@ -135,6 +136,17 @@ def http_auth_error_handler(request: Request, exc):
         }
     )
 
+def http_password_engine_busy_handler(request: Request, exc: PasswordEngineBusy):
+    log.warning("PasswordEngineBusy: pending=%s", exc.pending)
+    return JSONResponse(
+        status_code=503,
+        content={
+            "code": 503,
+            "state": "Service Unavailable",
+            "message": "Server is busy, try again later"
+        }
+    )
+
 def add_error_handler(app):
     log.info("Adding error handlers")
     app.add_exception_handler(HTTPException, http_exception_handler)
@@ -144,4 +156,5 @@ def add_error_handler(app):
     app.add_exception_handler(HTTP_500_INTERNAL_SERVER_ERROR, http_internal_server_error_handler)
     app.add_exception_handler(HTTP_404_NOT_FOUND, http_not_found_handler)
     app.add_exception_handler(AuthError, http_auth_error_handler)
+    app.add_exception_handler(PasswordEngineBusy, http_password_engine_busy_handler)
     return app
\ No newline at end of file
@@ -0,0 +1,35 @@
+from time import perf_counter
+
+from core.monitoring import metrics
+from sql import instrumentation
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        status = 500
+        query_stats = instrumentation.begin()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight -= 1
+            # the router stores the matched route on the shared scope, giving the path template
+            route = scope.get("route")
+            route_path = route.path if route is not None else "unmatched"
+            metrics.observe(scope["method"], route_path, status, perf_counter() - started, query_stats.statements, query_stats.seconds)
+            instrumentation.check_budget(scope["method"], route_path, query_stats)
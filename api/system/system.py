@@ -0,0 +1,105 @@
+import logging
+
+import anyio.to_thread
+from fastapi import APIRouter
+from starlette.responses import JSONResponse, PlainTextResponse
+
+from core import availability, http, providers, revocation
+from core.cryptography import password_engine
+from core.jwt import jwt
+from core.monitoring import metrics
+from core.user_service import principal_cache
+from sql.database import pool_stats
+
+router = APIRouter(
+    prefix="/api",
+    tags=["system"]
+)
+
+log = logging.getLogger(__name__)
+
+def collect_stats() -> dict:
+    # only report the reCAPTCHA cache once the provider is loaded, reading it must not pull in the SDK
+    recaptcha = providers.loaded("google.recaptcha")
+    return {
+        "database": pool_stats(),
+        "password_engine": password_engine.stats(),
+        "jwt_cache": jwt.cache_stats(),
+        "principal_cache": principal_cache.stats(),
+        "recaptcha_cache": recaptcha.cache_stats() if recaptcha is not None else {},
+        "providers": http.stats(),
+        "provider_modules": providers.stats(),
+        "revocation": revocation.stats(),
+        "user_id_availability": availability.stats()
+    }
+
+@router.get(
+    path="/system/stats",
+    summary="Get runtime statistics",
+    description="Get runtime statistics of this worker process such as database connection pool usage password hashing queue and caches.",
+    responses={
+        200: {
+            "description": "Runtime statistics",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 200,
+                        "state": "OK",
+                        "stats": {
+                            "database": {
+                                "size": 5,
+                                "checked_in": 3,
+                                "checked_out": 2,
+                                "overflow": -3,
+                                "timeouts": 0,
+                                "wait": {
+                                    "count": 120,
+                                    "total_seconds": 0.0131,
+                                    "avg_seconds": 0.000109,
+                                    "max_seconds": 0.0021
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+)
+async def get_stats():
+    return JSONResponse(
+        content={
+            "code": 200,
+            "state": "OK",
+            "stats": collect_stats()
+        }
+    )
+
+@router.get(
+    path="/metrics",
+    summary="Get Prometheus metrics",
+    description="Get per-route request counts, status codes and latency histograms, in-flight requests, threadpool saturation and runtime statistics in Prometheus text format.",
+    response_class=PlainTextResponse,
+    responses={
+        200: {
+            "description": "Metrics in Prometheus text exposition format",
+            "content": {
+                "text/plain": {
+                    "example": "withyou_http_requests_total{method=\"GET\",route=\"/api/user/get\",status=\"200\"} 42"
+                }
+            }
+        }
+    }
+)
+async def get_metrics():
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    lines = metrics.render_http()
+    lines += [
+        "# TYPE withyou_threadpool_borrowed_tokens gauge",
+        "withyou_threadpool_borrowed_tokens {}".format(limiter.borrowed_tokens),
+        "# TYPE withyou_threadpool_total_tokens gauge",
+        "withyou_threadpool_total_tokens {}".format(limiter.total_tokens),
+    ]
+    lines += metrics.render_gauges("withyou", collect_stats())
+
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
@@ -2,21 +2,21 @@ import logging
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.params import Depends, Security
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import JSONResponse
 
 from api.authentication.authorization import oauth_schema
 from core.authentication.auth_methods_service import OAuthMethods
 from core.authentication.authorization import authorize_jwt
-from core.cryptography.brypt import hash_bcrypt
-from core.google.recaptcha import verify_recaptcha
-from core.user_service import user_service
+from core import availability, providers
+from core.cryptography import password_engine
+from core.user_service import user_service, principal_cache
 from models import User
-from schemas.request_models.user_requests import AddUserRequest
+from schemas.request_models.user_requests import AddUserRequest, UserLookupRequest
 from models.user import Role
 from schemas.user import UserSchema, JwtUser
-from sql.database import create_connection
-from sql.repository import user_repository, password_method_repository
+from sql.database import create_async_connection
+from sql.repository import user_repository
 
 router = APIRouter(
     prefix="/api/user",
@@ -25,25 +25,31 @@ router = APIRouter(
 
 log = logging.getLogger(__name__)
 
-def get_active_user(db: Session = Depends(create_connection), authorization: str = Depends(oauth_schema)) -> JwtUser:
-    log.debug("Getting user information upon JWT. jwt=\"{}\"".format(authorization))
+async def get_active_user(db: AsyncSession = Depends(create_async_connection), authorization: str = Depends(oauth_schema)) -> JwtUser:
+    log.debug("Getting user information upon JWT. jwt=\"%s\"", authorization)
     token = authorize_jwt(authorization)
 
     sub = token.get("sub")
 
-    user = user_repository.get_user_by_uid(db, sub)
+    jwt_user = principal_cache.get(sub)
+    if jwt_user is not None:
+        return jwt_user
+
+    user = await user_repository.get_user_by_uid(db, sub)
     if user is None:
-        log.debug("User specified by JWT was not found. user_uid=\"{}\"".format(sub))
+        log.debug("User specified by JWT was not found. user_uid=\"%s\"", sub)
         raise HTTPException(status_code=400, detail="User not found")
 
-    log.debug("User information retrieved. user=\"{}\", ".format(user.role))
-    jwt_user = JwtUser(
+    log.debug("User information retrieved. user=\"%s\", ", user.role)
+    # the row comes from our own database, so the schema validators are skipped
+    jwt_user = JwtUser.model_construct(
         uid=user.uid,
         uname=user.uname,
         email=user.email,
         email_verified=user.email_verified,
         role=user.role
     )
+    principal_cache.put(jwt_user)
     return jwt_user
 
 
@@ -107,8 +113,8 @@ def get_active_user(db: Session = Depends(create_connection), authorization: str
         }
     }
 )
-def get_user(user: JwtUser = Security(get_active_user)):
-    log.debug("Responding user information. user_uid=\"{}\"".format(user.uid))
+async def get_user(user: JwtUser = Security(get_active_user)):
+    log.debug("Responding user information. user_uid=\"%s\"", user.uid)
     return JSONResponse(
         content={
             "code": 200,
@@ -123,6 +129,70 @@ def get_user(user: JwtUser = Security(get_active_user)):
         }
     )
 
+@router.post(
+    path="/get/bulk",
+    summary="Get public profiles of many users",
+    description="Get the public profiles of up to user.lookup_limit users by uid in one request. Profiles are returned in the order of the uids. Uids that do not belong to any user are listed in missing.",
+    responses={
+        200: {
+            "description": "Public profiles",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 200,
+                        "state": "OK",
+                        "users": [
+                            {
+                                "uid": 1,
+                                "uname": "Kim"
+                            },
+                            {
+                                "uid": 2,
+                                "uname": "Lee"
+                            }
+                        ],
+                        "missing": [3]
+                    }
+                }
+            }
+        },
+        400: {
+            "description": "No uids or more uids than the lookup limit were passed"
+        },
+        401: {
+            "description": "Invalid JWT token",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "code": 401,
+                        "state": "Unauthorized",
+                        "message": "You are not authorized to access this resource"
+                    }
+                }
+            }
+        }
+    }
+)
+async def get_users(body: UserLookupRequest, user: JwtUser = Security(get_active_user), db: AsyncSession = Depends(create_async_connection)):
+    log.debug("Looking up users. user_uid=\"%s\", count=\"%s\"", user.uid, len(body.uids))
+    principals = await user_service.get_principals(db, body.uids)
+
+    uids = list(dict.fromkeys(body.uids))
+    return JSONResponse(
+        content={
+            "code": 200,
+            "state": "OK",
+            "users": [
+                {
+                    "uid": principals[uid].uid,
+                    "uname": principals[uid].uname
+                }
+                for uid in uids if uid in principals
+            ],
+            "missing": [uid for uid in uids if uid not in principals]
+        }
+    )
+
 @router.post(
     path="/add",
     summary="Add user",
@@ -141,11 +211,11 @@ def get_user(user: JwtUser = Security(get_active_user)):
         }
     }
 )
-def add_user(user_body: AddUserRequest, request: Request, db: Session = Depends(create_connection)):
-    log.debug("Adding new user. user_id=\"{}\", email=\"{}\"".format(user_body.id, user_body.email))
-    recaptcha = verify_recaptcha(user_body.recaptcha, request.client.host, "signup")
+async def add_user(user_body: AddUserRequest, request: Request, db: AsyncSession = Depends(create_async_connection)):
+    log.debug("Adding new user. user_id=\"%s\", email=\"%s\"", user_body.id, user_body.email)
+    recaptcha = await providers.get("google.recaptcha").verify_recaptcha(user_body.recaptcha, request.client.host, "signup")
     if not recaptcha:
-        log.debug("Recaptcha verification failed and signup was canceled. user_id=\"{}\"".format(user_body.id))
+        log.debug("Recaptcha verification failed and signup was canceled. user_id=\"%s\"", user_body.id)
         return JSONResponse(
             content={
                 "code": 400,
@@ -163,18 +233,19 @@ def add_user(user_body: AddUserRequest, request: Request, db: Session = Depends(
         sex = user_body.sex
     )
 
-    user_service.add_user(
+    await user_service.add_user(
         user,
         OAuthMethods.PASSWORD,
         {
             'user_id': user_body.id,
-            'password': hash_bcrypt(user_body.password)
+            'password': await password_engine.hash_password(user_body.password)
         },
         db
     )
-    db.commit()
+    await db.commit()
+    availability.remember(user_body.id)
 
-    log.debug("User added successfully. user_id=\"{}\"".format(user_body.id))
+    log.debug("User added successfully. user_id=\"%s\"", user_body.id)
     return JSONResponse(
         content={
             "code": 200,
@@ -185,7 +256,7 @@ def add_user(user_body: AddUserRequest, request: Request, db: Session = Depends(
 @router.get(
     path="/add/check-id",
     summary="Check if given user id is available",
-    description="Check if given user id is available to use. This endpoint searches PasswordMethod table to check if the given user id is already used or not.",
+    description="Check if given user id is available to use. Ids that were never taken are answered from memory, the PasswordMethod table is only searched when the id may be taken. Ids taken through another server process in the last few seconds may still be reported as available.",
     responses={
         200: {
             "description": "User id is available",
@@ -200,7 +271,7 @@ def add_user(user_body: AddUserRequest, request: Request, db: Session = Depends(
         },
     }
 )
-def check_user_id(request: Request, db: Session = Depends(create_connection)):
+async def check_user_id(request: Request):
     id = request.query_params.get("id")
     if id is None:
         return JSONResponse(
@@ -212,7 +283,7 @@ def check_user_id(request: Request, db: Session = Depends(create_connection)):
             status_code=400
         )
 
-    if password_method_repository.exists_by_userid(db, id):
+    if await availability.is_taken(id):
         return JSONResponse(
             content={
                 "code": 200,
@@ -260,11 +331,11 @@ def check_user_id(request: Request, db: Session = Depends(create_connection)):
         }
     }
 )
-def get_last_login(user: JwtUser = Security(get_active_user), db: Session = Depends(create_connection)):
-    log.debug("Getting last login time. user_id=\"{}\"".format(user.uid))
-    last_login = user_service.get_last_login(db, user.uid)
+async def get_last_login(user: JwtUser = Security(get_active_user), db: AsyncSession = Depends(create_async_connection)):
+    log.debug("Getting last login time. user_id=\"%s\"", user.uid)
+    last_login = await user_service.get_last_login(db, user.uid)
     if last_login is None:
-        log.debug("User have not logged in yet. user_id=\"{}\"".format(user.uid))
+        log.debug("User have not logged in yet. user_id=\"%s\"", user.uid)
         return JSONResponse(
             content={
                 "code": 200,
@@ -273,7 +344,7 @@ def get_last_login(user: JwtUser = Security(get_active_user), db: Session = Depe
             }
         )
 
-    log.debug("Last login time retrieved. user_id=\"{}\", last_login=\"{}\"".format(user.uid, last_login))
+    log.debug("Last login time retrieved. user_id=\"%s\", last_login=\"%s\"", user.uid, last_login)
     return JSONResponse(
         content={
             "code": 200,
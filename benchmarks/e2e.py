@@ -0,0 +1,246 @@
+import argparse
+import asyncio
+import logging
+import secrets
+import sys
+from time import perf_counter
+
+import httpx
+
+from benchmarks import report
+
+COMPARED_METRICS = {"throughput_rps": True, "p50_ms": False, "p99_ms": False}
+
+
+class Context:
+    def __init__(self, oauth_accounts: int):
+        self.oauth_accounts = oauth_accounts
+        self.run_id = secrets.token_hex(4)
+        self.counter = 0
+        self.userid = None
+        self.password = "bench-" + secrets.token_urlsafe(8)
+        self.auth_headers = {}
+
+    def next_id(self) -> str:
+        self.counter += 1
+        return "b{}x{}".format(self.run_id, self.counter)
+
+
+def _signup_body(ctx: Context, userid: str) -> dict:
+    return {
+        "name": "bench",
+        "email": "{}@bench.example.com".format(userid),
+        "id": userid,
+        "password": ctx.password,
+        "recaptcha": "bench-" + userid
+    }
+
+async def _oauth_requests(client: httpx.AsyncClient, provider: str, accounts: list[str]) -> list[dict]:
+    requests = []
+    for account in accounts:
+        response = await client.get("/api/auth/signin/{}".format(provider))
+        state = httpx.URL(response.headers["location"]).params["state"]
+        requests.append({
+            "method": "GET",
+            "url": "/api/auth/callback/{}".format(provider),
+            "params": {"state": state, "code": account},
+            "headers": {"Cookie": "with-state={}".format(response.cookies["with-state"])}
+        })
+    return requests
+
+async def user_get(client, ctx, count):
+    return [{"method": "GET", "url": "/api/user/get", "headers": ctx.auth_headers}] * count
+
+async def user_add(client, ctx, count):
+    return [{"method": "POST", "url": "/api/user/add", "json": _signup_body(ctx, ctx.next_id())} for _ in range(count)]
+
+async def user_check_id(client, ctx, count):
+    # half of the lookups hit an existing id, half miss
+    return [
+        {"method": "GET", "url": "/api/user/add/check-id", "params": {"id": ctx.userid if i % 2 else ctx.next_id()}}
+        for i in range(count)
+    ]
+
+async def signin_password(client, ctx, count):
+    return [
+        {
+            "method": "POST",
+            "url": "/api/auth/signin/password",
+            "json": {"id": ctx.userid, "password": ctx.password, "recaptcha": "bench-{}-{}".format(ctx.run_id, i)}
+        }
+        for i in range(count)
+    ]
+
+async def authorization(client, ctx, count):
+    return [{"method": "POST", "url": "/api/auth/authorization", "headers": ctx.auth_headers}] * count
+
+async def callback_google(client, ctx, count):
+    # a bounded pool of accounts: the first visit signs up, later visits sign in
+    return await _oauth_requests(client, "google", ["g{}x{}".format(ctx.run_id, i % ctx.oauth_accounts) for i in range(count)])
+
+SCENARIOS = {
+    "user.get": user_get,
+    "user.add": user_add,
+    "user.check_id": user_check_id,
+    "auth.signin.password": signin_password,
+    "auth.authorization": authorization,
+    "auth.callback.google": callback_google,
+    # no auth.callback.kakao: core/kakao/oauth.py looks Kakao accounts up as Google ones with the raw id, so every callback fails
+}
+
+
+def _succeeded(response: httpx.Response) -> bool:
+    # callbacks answer with a 302 either way, so the redirect target tells success from failure
+    if response.status_code == 302:
+        return "error=" not in response.headers.get("location", "")
+    if response.status_code != 200:
+        return False
+    return response.json().get("result") != "fail"
+
+async def measure(client: httpx.AsyncClient, requests: list[dict], concurrency: int) -> dict:
+    latencies = []
+    statuses = {}
+    failures = 0
+    pending = iter(requests)
+
+    async def worker():
+        nonlocal failures
+        for request in pending:
+            started = perf_counter()
+            response = await client.request(**request)
+            latencies.append(perf_counter() - started)
+
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+            if not _succeeded(response):
+                failures += 1
+
+    started = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 4),
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50_ms": round(report.percentile(latencies, 0.50) * 1000, 3),
+        "p90_ms": round(report.percentile(latencies, 0.90) * 1000, 3),
+        "p99_ms": round(report.percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "statuses": statuses,
+        "failures": failures
+    }
+
+async def prepare_account(client: httpx.AsyncClient, ctx: Context):
+    ctx.userid = ctx.next_id()
+    response = await client.post("/api/user/add", json=_signup_body(ctx, ctx.userid))
+    if response.status_code != 200:
+        raise RuntimeError("Could not create the benchmark user: {} {}".format(response.status_code, response.text))
+
+    response = await client.post("/api/auth/signin/password", json={"id": ctx.userid, "password": ctx.password, "recaptcha": "bench-signin"})
+    token = response.json().get("token")
+    if token is None:
+        raise RuntimeError("Could not sign in the benchmark user: {}".format(response.text))
+    ctx.auth_headers = {"Authorization": "Bearer {}".format(token)}
+
+async def create_schema():
+    from sqlalchemy import text
+
+    from sql.database import Base, async_engine
+
+    async with async_engine.begin() as conn:
+        for schema in sorted({table.schema for table in Base.metadata.sorted_tables if table.schema}):
+            await conn.execute(text('CREATE SCHEMA IF NOT EXISTS "{}"'.format(schema)))
+        await conn.run_sync(Base.metadata.create_all)
+
+async def run(args) -> dict:
+    from benchmarks import fakes
+
+    fakes.install(recaptcha_latency=args.recaptcha_latency / 1000, provider_latency=args.provider_latency / 1000)
+
+    import main
+
+    if args.create_schema:
+        await create_schema()
+
+    ctx = Context(args.oauth_accounts)
+    results = {}
+
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app, raise_app_exceptions=False, client=("127.0.0.1", 50000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await prepare_account(client, ctx)
+
+            for name in args.endpoints:
+                scenario = SCENARIOS[name]
+                if args.warmup:
+                    await measure(client, await scenario(client, ctx, args.warmup), args.concurrency)
+
+                result = await measure(client, await scenario(client, ctx, args.requests), args.concurrency)
+                results[name] = result
+                print("{:<22} {:>9.1f} req/s  p50 {:>8.2f} ms  p99 {:>8.2f} ms  failures {}".format(
+                    name, result["throughput_rps"], result["p50_ms"], result["p99_ms"], result["failures"]
+                ), flush=True)
+
+    return results
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.e2e",
+        description="Drive the FastAPI app in-process against the configured Postgres, with reCAPTCHA, Google and Kakao faked locally."
+    )
+    parser.add_argument("--endpoints", default=",".join(SCENARIOS), help="comma separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16, help="requests in flight at once")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per endpoint before measuring")
+    parser.add_argument("--oauth-accounts", type=int, default=50, help="distinct fake accounts used by the OAuth callbacks")
+    parser.add_argument("--recaptcha-latency", type=float, default=0.0, help="simulated reCAPTCHA latency in ms")
+    parser.add_argument("--provider-latency", type=float, default=0.0, help="simulated Google/Kakao latency in ms")
+    parser.add_argument("--database", help="database name to use instead of the configured one, e.g. a disposable copy")
+    parser.add_argument("--create-schema", action="store_true", help="create missing schemas and tables before running")
+    parser.add_argument("--output", help="result file, defaults to benchmarks/results/e2e-<commit>-<time>.json")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="relative change reported as a regression")
+
+    args = parser.parse_args(argv)
+    args.endpoints = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = [name for name in args.endpoints if name not in SCENARIOS]
+    if unknown:
+        parser.error("unknown endpoints: {}".format(", ".join(unknown)))
+    return args
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    from config import config
+
+    if config["env"] == "production":
+        print("Refusing to benchmark against a production configuration", file=sys.stderr)
+        return 2
+    if args.database:
+        config["database"]["name"] = args.database
+
+    from core import log
+
+    log.configure()
+    # the harness's own client would otherwise log every request it sends
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    results = asyncio.run(run(args))
+    settings = {key: value for key, value in vars(args).items() if key not in ("output", "compare")}
+    settings["database"] = config["database"]["name"]
+    doc = report.document("e2e", settings, results)
+    print("Saved results to {}".format(report.save(doc, args.output)))
+
+    if args.compare:
+        baseline = report.load(args.compare)
+        rows, regressions = report.compare(baseline, doc, COMPARED_METRICS, args.tolerance)
+        print(report.format_comparison(baseline, rows))
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
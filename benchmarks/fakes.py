@@ -0,0 +1,88 @@
+import asyncio
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+
+import httpx
+
+from config import config
+from core.google import recaptcha
+from core.google.oauth import client_secrets
+from core.google.user_service import GOOGLE_USER_INFO_URI
+from core.http import client as http_client
+
+
+class FakeRecaptchaClient:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def create_assessment(self, request, timeout=None):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return SimpleNamespace(
+            token_properties=SimpleNamespace(valid=True),
+            risk_analysis=SimpleNamespace(score=0.9)
+        )
+
+
+class FakeProviders:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.routes = {
+            client_secrets()['token_uri']: self.google_token,
+            GOOGLE_USER_INFO_URI: self.google_user_info,
+            config['auth']['kakao']['token_uri']: self.kakao_token,
+            config['auth']['kakao']['user_info_uri']: self.kakao_user_info
+        }
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        handler = self.routes.get(str(request.url.copy_with(query=None)))
+        if handler is None:
+            return httpx.Response(404, json={"error": "unknown endpoint"})
+        return handler(request)
+
+    # the access token simply carries the authorization code, so the user info
+    # endpoints can tell which fake account a callback belongs to
+    @staticmethod
+    def _code(request: httpx.Request) -> str:
+        return parse_qs(request.content.decode())['code'][0]
+
+    @staticmethod
+    def _access_token(request: httpx.Request) -> str:
+        return request.headers['Authorization'].removeprefix('Bearer ')
+
+    def google_token(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"access_token": self._code(request), "token_type": "Bearer", "expires_in": 3599})
+
+    def google_user_info(self, request: httpx.Request) -> httpx.Response:
+        account = self._access_token(request)
+        return httpx.Response(200, json={
+            "id": account,
+            "name": "bench",
+            "email": "{}@bench.example.com".format(account),
+            "verified_email": True,
+            "picture": "https://example.com/{}.png".format(account)
+        })
+
+    def kakao_token(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"access_token": self._code(request), "token_type": "bearer", "expires_in": 21599})
+
+    def kakao_user_info(self, request: httpx.Request) -> httpx.Response:
+        account = self._access_token(request)
+        return httpx.Response(200, json={
+            "id": account,
+            "kakao_account": {
+                "profile": {
+                    "nickname": "bench",
+                    "profile_image_url": "https://example.com/{}.png".format(account)
+                }
+            }
+        })
+
+
+def install(recaptcha_latency: float = 0.0, provider_latency: float = 0.0):
+    # replaces the outbound clients before the app lifespan starts, so nothing leaves the process
+    recaptcha.get_client = lambda: FakeRecaptchaClient(recaptcha_latency)
+    http_client._client = httpx.AsyncClient(transport=httpx.MockTransport(FakeProviders(provider_latency)))
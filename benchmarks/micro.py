@@ -0,0 +1,157 @@
+import argparse
+import os
+import statistics
+import sys
+import timeit
+
+from benchmarks import report
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "micro.json")
+# the fastest sample is the least disturbed by other load on the machine, as timeit recommends
+COMPARED_METRICS = {"min_ns": False}
+
+
+def jwt_benchmarks() -> dict:
+    from core.jwt import jwt
+    from models.user import Role
+
+    token = jwt.create_token(1, Role.USER)
+    jwt.decode(token)
+
+    def decode_uncached():
+        # with the cache disabled every call pays for the signature check
+        size, jwt.JWT_CACHE_SIZE = jwt.JWT_CACHE_SIZE, 0
+        try:
+            jwt._verified_tokens.clear()
+            jwt.decode(token)
+        finally:
+            jwt.JWT_CACHE_SIZE = size
+
+    return {
+        "jwt.create_token": lambda: jwt.create_token(1, Role.USER),
+        "jwt.decode.cached": lambda: jwt.decode(token),
+        "jwt.decode.verify": decode_uncached,
+    }
+
+def oauth_state_benchmarks() -> dict:
+    from core.cryptography import oauth_state
+
+    state = "0123456789abcdef0123456789abcdef"
+    signed = oauth_state.sign(state)
+
+    return {
+        "oauth_state.sign": lambda: oauth_state.sign(state),
+        "oauth_state.verify": lambda: oauth_state.verify(signed, state),
+    }
+
+def revocation_benchmarks() -> dict:
+    from core import revocation
+
+    return {
+        "revocation.is_revoked": lambda: revocation.is_revoked("Jm2CkVb4TyxU1fq8R0NwGg"),
+    }
+
+def bcrypt_benchmarks() -> dict:
+    from core.cryptography.brypt import hash_bcrypt, verify_bcrypt
+
+    hashed = hash_bcrypt("benchmark-password")
+
+    return {
+        "bcrypt.hash": lambda: hash_bcrypt("benchmark-password"),
+        "bcrypt.verify": lambda: verify_bcrypt("benchmark-password", hashed),
+    }
+
+def schema_benchmarks() -> dict:
+    from models.user import Role
+    from schemas.request_models.user_requests import AddUserRequest
+    from schemas.user import JwtUser, UserSchema
+
+    user = {"uid": 1, "uname": "bench", "email": "bench@example.com", "email_verified": True, "role": Role.USER}
+    add_user = {"name": "bench", "email": "bench@example.com", "id": "bench", "password": "benchmark", "recaptcha": "token"}
+
+    return {
+        "schema.user_schema": lambda: UserSchema(**user),
+        "schema.jwt_user": lambda: JwtUser(**user),
+        "schema.jwt_user.validate": lambda: JwtUser.model_validate(user),
+        "schema.add_user_request": lambda: AddUserRequest(**add_user),
+    }
+
+GROUPS = {
+    "jwt": jwt_benchmarks,
+    "oauth_state": oauth_state_benchmarks,
+    "revocation": revocation_benchmarks,
+    "bcrypt": bcrypt_benchmarks,
+    "schema": schema_benchmarks,
+}
+
+
+def measure(fn, repeat: int) -> dict:
+    timer = timeit.Timer(fn)
+    # autorange picks a loop count that runs for at least 0.2 s, so fast and slow primitives get comparable samples
+    number, _ = timer.autorange()
+    samples = [elapsed / number * 1e9 for elapsed in timer.repeat(repeat=repeat, number=number)]
+
+    return {
+        "loops": number,
+        "repeat": repeat,
+        "min_ns": round(min(samples), 1),
+        "median_ns": round(statistics.median(samples), 1),
+        "max_ns": round(max(samples), 1),
+        "ops_per_second": round(1e9 / statistics.median(samples), 1)
+    }
+
+def run(groups: list[str], repeat: int) -> dict:
+    results = {}
+    for group in groups:
+        for name, fn in GROUPS[group]().items():
+            results[name] = result = measure(fn, repeat)
+            print("{:<26} {:>14.1f} ns/op min  {:>14.1f} ns/op median".format(name, result["min_ns"], result["median_ns"]), flush=True)
+    return results
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.micro",
+        description="Time the primitives on the request path and compare them with a stored baseline."
+    )
+    parser.add_argument("--groups", default=",".join(GROUPS), help="comma separated subset of: " + ", ".join(GROUPS))
+    parser.add_argument("--repeat", type=int, default=5, help="timed samples per benchmark")
+    parser.add_argument("--output", help="result file, defaults to benchmarks/results/micro-<commit>-<time>.json")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--compare", nargs="?", const=BASELINE_PATH, help="fail when slower than the baseline, defaults to " + os.path.relpath(BASELINE_PATH))
+    parser.add_argument("--tolerance", type=float, default=0.15, help="relative slowdown that counts as a regression")
+
+    args = parser.parse_args(argv)
+    args.groups = [group.strip() for group in args.groups.split(",") if group.strip()]
+    unknown = [group for group in args.groups if group not in GROUPS]
+    if unknown:
+        parser.error("unknown groups: {}".format(", ".join(unknown)))
+    return args
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    results = run(args.groups, args.repeat)
+    doc = report.document("micro", {"groups": args.groups, "repeat": args.repeat}, results)
+    print("Saved results to {}".format(report.save(doc, args.output)))
+
+    if args.save_baseline:
+        print("Saved baseline to {}".format(report.save(doc, BASELINE_PATH)))
+
+    if args.compare:
+        if not os.path.exists(args.compare):
+            print("No baseline at {}, run with --save-baseline first".format(args.compare), file=sys.stderr)
+            return 2
+
+        baseline = report.load(args.compare)
+        if baseline.get("platform") != doc["platform"] or baseline.get("python") != doc["python"]:
+            print("Warning: baseline was recorded on {} with Python {}".format(baseline.get("platform"), baseline.get("python")), file=sys.stderr)
+
+        rows, regressions = report.compare(baseline, doc, COMPARED_METRICS, args.tolerance)
+        print(report.format_comparison(baseline, rows))
+        if regressions:
+            print("Regressed beyond {:.0%}: {}".format(args.tolerance, ", ".join(regressions)), file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+import json
+import math
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    # nearest-rank on an already sorted list
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+def git_revision() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True).stdout.strip() != ""
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+def document(kind: str, settings: dict, results: dict) -> dict:
+    return {
+        "kind": kind,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        **git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": settings,
+        "results": results
+    }
+
+def default_path(doc: dict) -> str:
+    return os.path.join(RESULTS_DIR, "{kind}-{commit}-{stamp}.json".format(
+        kind=doc["kind"],
+        commit=(doc["commit"] or "unknown")[:10],
+        stamp=datetime.now().strftime("%Y%m%d-%H%M%S")
+    ))
+
+def save(doc: dict, path: str = None) -> str:
+    path = path or default_path(doc)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(doc, f, indent=2)
+    return path
+
+def load(path: str) -> dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+def compare(baseline: dict, current: dict, metrics: dict[str, bool], tolerance: float) -> tuple[list[list], list[str]]:
+    # metrics maps a result key to whether a larger value is better
+    rows = []
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+
+        for metric, higher_is_better in metrics.items():
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+
+            change = (new - old) / old
+            regressed = -change > tolerance if higher_is_better else change > tolerance
+            rows.append([name, metric, old, new, change, regressed])
+            if regressed:
+                regressions.append("{} {}".format(name, metric))
+    return rows, regressions
+
+def format_table(header: list[str], rows: list[list]) -> str:
+    cells = [header] + [[_cell(value) for value in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(header))]
+    return "\n".join("  ".join(value.ljust(widths[i]) for i, value in enumerate(row)) for row in cells)
+
+def format_comparison(baseline: dict, rows: list[list]) -> str:
+    title = "compared with {} ({})".format((baseline.get("commit") or "unknown")[:10], baseline.get("created_at"))
+    return title + "\n" + format_table(
+        ["benchmark", "metric", "before", "after", "change", ""],
+        [[name, metric, old, new, "{:+.1%}".format(change), "REGRESSION" if regressed else ""] for name, metric, old, new, change, regressed in rows]
+    )
+
+def _cell(value) -> str:
+    if isinstance(value, float):
+        return "{:.3f}".format(value)
+    return str(value)
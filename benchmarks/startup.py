@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from time import perf_counter
+
+from benchmarks import report
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATHS = ["/api/system/stats", "/api/auth/signin/google"]
+COMPARED_METRICS = {"import_main_ms": False, "time_to_first_request_ms": False}
+
+
+def import_profile() -> list[dict]:
+    # -X importtime writes "import time: self [us] | cumulative | imported package" for every module to stderr
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError("Importing main failed:\n" + completed.stderr[-2000:])
+
+    modules = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000
+        })
+    return modules
+
+def by_package(modules: list[dict]) -> dict[str, float]:
+    packages = {}
+    for module in modules:
+        package = module["module"].split(".")[0]
+        packages[package] = packages.get(package, 0.0) + module["self_ms"]
+    return {package: round(ms, 3) for package, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)}
+
+async def _start_and_request(paths: list[str]) -> dict:
+    started = perf_counter()
+    import main
+    imported = perf_counter()
+
+    import httpx
+
+    timings = {"import_main_ms": (imported - started) * 1000, "first_requests": {}}
+    async with main.app.router.lifespan_context(main.app):
+        timings["lifespan_start_ms"] = (perf_counter() - imported) * 1000
+
+        transport = httpx.ASGITransport(app=main.app, raise_app_exceptions=False, client=("127.0.0.1", 50000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+            for path in paths:
+                request_started = perf_counter()
+                response = await client.get(path)
+                if "first_response_at" not in timings:
+                    timings["first_response_at"] = time.time()
+                timings["first_requests"][path] = {"ms": (perf_counter() - request_started) * 1000, "status": response.status_code}
+    return timings
+
+def child(paths: list[str]):
+    print(json.dumps(asyncio.run(_start_and_request(paths))))
+
+def first_request(paths: list[str]) -> dict:
+    # a fresh interpreter each time, so nothing is already imported or cached
+    spawned_at = time.time()
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child", *("--path={}".format(path) for path in paths)],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError("Startup run failed:\n" + completed.stderr[-2000:])
+
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    timings["time_to_first_request_ms"] = (timings.pop("first_response_at") - spawned_at) * 1000
+    return timings
+
+def summarize(runs: list[dict], paths: list[str]) -> dict:
+    summary = {
+        key: round(statistics.median(run[key] for run in runs), 3)
+        for key in ("import_main_ms", "lifespan_start_ms", "time_to_first_request_ms")
+    }
+    for path in paths:
+        summary["first " + path] = {
+            "ms": round(statistics.median(run["first_requests"][path]["ms"] for run in runs), 3),
+            "status": runs[-1]["first_requests"][path]["status"]
+        }
+    return summary
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.startup",
+        description="Report per-module import cost of main.py and the time from process start to the first answered request."
+    )
+    parser.add_argument("--path", action="append", dest="paths", help="path requested after startup, may be repeated")
+    parser.add_argument("--runs", type=int, default=3, help="fresh processes to start, the median is reported")
+    parser.add_argument("--top", type=int, default=25, help="slowest modules and packages to print")
+    parser.add_argument("--output", help="result file, defaults to benchmarks/results/startup-<commit>-<time>.json")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="relative slowdown that counts as a regression")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+    args.paths = args.paths or DEFAULT_PATHS
+    return args
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.child:
+        child(args.paths)
+        return 0
+
+    modules = import_profile()
+    packages = by_package(modules)
+
+    print("Slowest imports (cumulative)")
+    slowest = sorted(modules, key=lambda module: module["cumulative_ms"], reverse=True)[:args.top]
+    print(report.format_table(["module", "self ms", "cumulative ms"], [[module["module"], module["self_ms"], module["cumulative_ms"]] for module in slowest]))
+    print()
+    print("Import cost by top-level package (self)")
+    print(report.format_table(["package", "ms"], [[package, ms] for package, ms in list(packages.items())[:args.top]]))
+    print()
+
+    runs = [first_request(args.paths) for _ in range(args.runs)]
+    summary = summarize(runs, args.paths)
+    print("Startup, median of {} runs".format(args.runs))
+    print(report.format_table(["phase", "ms"], [[key, value["ms"] if isinstance(value, dict) else value] for key, value in summary.items()]))
+
+    doc = report.document("startup", {"paths": args.paths, "runs": args.runs}, {"startup": summary})
+    doc["imports"] = {"packages_ms": packages, "slowest_modules": slowest}
+    print("Saved results to {}".format(report.save(doc, args.output)))
+
+    if args.compare:
+        baseline = report.load(args.compare)
+        rows, regressions = report.compare(baseline, doc, COMPARED_METRICS, args.tolerance)
+        print(report.format_comparison(baseline, rows))
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,23 @@
+import os
+from collections import UserDict
+
 import yaml
 
-config = dict()
+CONFIG_PATH = os.environ.get("WITHYOU_CONFIG", "config_dev.yml")
+
+
+class LazyConfig(UserDict):
+    # the file is read on first access rather than on import, and its path can be set with WITHYOU_CONFIG
+    def __init__(self, path: str):
+        self.path = path
+        self._data = None
+
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            with open(self.path, "r") as f:
+                self._data = yaml.load(f, Loader=yaml.FullLoader)
+        return self._data
+
 
-with open("config_dev.yml", "r") as f:
-    config.update(yaml.load(f, Loader=yaml.FullLoader))
-    ENV = config['env']
+config = LazyConfig(CONFIG_PATH)
@@ -1,11 +1,11 @@
 from enum import Enum
 from typing import Union
 
-from requests import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.auth_methods import AuthMethods
 from models.user import User
-from sql.repository import google_method_repository
+from sql.repository import auth_methods_repository
 
 
 class OAuthMethods(Enum):
@@ -13,9 +13,9 @@ class OAuthMethods(Enum):
     KAKAO = "kakao"
     PASSWORD = "password"
 
-def find_user(unique_id: str, method: OAuthMethods, db: Session) -> Union[User, None]:
+async def find_user(unique_id: str, method: OAuthMethods, db: AsyncSession) -> Union[User, None]:
     if method == OAuthMethods.GOOGLE:
-        auth_methods = find_google_user(unique_id, db)
+        auth_methods = await find_google_user(unique_id, db)
     else:
         return None
 
@@ -25,10 +25,5 @@ def find_user(unique_id: str, method: OAuthMethods, db: Session) -> Union[User,
     return auth_methods.user
 
 
-def find_google_user(google_id: str, db: Session) -> Union[AuthMethods, None]:
-    method = google_method_repository.select_by_id(db, google_id)
-
-    if method is None:
-        return None
-
-    return method.auth_methods
\ No newline at end of file
+async def find_google_user(google_id: str, db: AsyncSession) -> Union[AuthMethods, None]:
+    return await auth_methods_repository.get_by_google_id(db, google_id)
\ No newline at end of file
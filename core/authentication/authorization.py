@@ -4,6 +4,7 @@ from fastapi import HTTPException
 from fastapi.security import APIKeyHeader
 from jwt import InvalidTokenError
 
+from core import revocation
 from core.jwt import jwt
 
 log = logging.getLogger(__name__)
@@ -14,6 +15,12 @@ class APIKeyHeaderBearer(APIKeyHeader):
 
 oauth_schema = APIKeyHeaderBearer()
 
+def verify_jwt(jwt_token: str) -> dict:
+    jwt_body = jwt.decode(jwt_token)
+    if revocation.is_revoked(jwt_body.get("jti")):
+        raise InvalidTokenError("JWT was revoked")
+    return jwt_body
+
 def authorize_jwt(token: str):
     if token is None:
         log.debug("Auth failed: Authorization header is missing")
@@ -29,7 +36,7 @@ def authorize_jwt(token: str):
         raise HTTPException(status_code=400, detail="JWT token is missing")
 
     try:
-        jwt_body = jwt.decode(jwt_token)
+        jwt_body = verify_jwt(jwt_token)
     except (InvalidTokenError, Exception):
         log.debug("Auth failed: JWT is invalid or unauthorized")
         raise HTTPException(status_code=401, detail="JWT is invalid or unauthorized")
@@ -38,5 +45,12 @@ def authorize_jwt(token: str):
         log.debug("Auth failed: JWT is invalid or unauthorized")
         raise HTTPException(status_code=401, detail="JWT is invalid or unauthorized")
 
-    log.debug("Authorized JWT token. jwt=\"{}\"".format(token))
+    log.debug("Authorized JWT token. jwt=\"%s\"", token)
+    return jwt_body
+
+def authorize_admin(token: str):
+    jwt_body = authorize_jwt(token)
+    if 'with:admin' not in (jwt_body.get("aud") or []):
+        log.debug("Auth failed: JWT does not grant admin access. user_uid=\"%s\"", jwt_body.get("sub"))
+        raise HTTPException(status_code=403, detail="Admin access is required")
     return jwt_body
@@ -0,0 +1 @@
+from .availability import is_taken, remember, refresh, start, stop, stats
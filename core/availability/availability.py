@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from time import monotonic
+from typing import Optional
+
+from config import config
+from core.bloom import BloomFilter
+from sql.database import AsyncSessionLocal
+from sql.repository import password_method_repository
+
+log = logging.getLogger(__name__)
+
+
+def _settings() -> dict:
+    return (config.get('user') or {}).get('availability') or {}
+
+REFRESH_INTERVAL = _settings().get('refresh_interval', 10)
+REBUILD_INTERVAL = _settings().get('rebuild_interval', 86400)
+# password methods are read again from this many uids below the highest one seen, covering inserts that committed late
+REFRESH_OVERLAP = _settings().get('refresh_overlap', 1000)
+BATCH_SIZE = _settings().get('batch_size', 10000)
+BLOOM_CAPACITY = _settings().get('bloom_capacity', 1000000)
+BLOOM_ERROR_RATE = _settings().get('bloom_error_rate', 0.01)
+
+# taken user ids; an id missing from the filter is certainly available, an id in it is checked against the database
+_filter: Optional[BloomFilter] = None
+_last_uid = 0
+_last_refresh: Optional[float] = None
+_last_rebuild: Optional[float] = None
+_task: Optional[asyncio.Task] = None
+
+checks = 0
+filter_negatives = 0
+false_positives = 0
+refresh_errors = 0
+
+async def is_taken(userid: str) -> bool:
+    global checks, filter_negatives, false_positives
+    checks += 1
+    if _filter is not None and userid not in _filter:
+        filter_negatives += 1
+        return False
+
+    async with AsyncSessionLocal() as db:
+        taken = await password_method_repository.exists_by_userid(db, userid)
+    if _filter is not None and not taken:
+        false_positives += 1
+    return taken
+
+def remember(userid: str):
+    # taken at once in this worker, the others see it on their next refresh
+    if _filter is not None and userid not in _filter:
+        _filter.add(userid)
+
+async def _load(bloom: BloomFilter, after_uid: int) -> int:
+    last_uid = after_uid
+    async with AsyncSessionLocal() as db:
+        async for rows in password_method_repository.stream_userids(db, after_uid, BATCH_SIZE):
+            for uid, userid in rows:
+                # re-read overlap rows are already in the filter and must not count twice
+                if userid not in bloom:
+                    bloom.add(userid)
+            last_uid = max(last_uid, rows[-1].uid)
+    return last_uid
+
+async def rebuild():
+    global _filter, _last_uid, _last_refresh, _last_rebuild
+    capacity = max(BLOOM_CAPACITY, _filter.count * 2) if _filter is not None else BLOOM_CAPACITY
+    bloom = BloomFilter(capacity, BLOOM_ERROR_RATE)
+    last_uid = await _load(bloom, 0)
+
+    _filter = bloom
+    _last_uid = last_uid
+    _last_refresh = _last_rebuild = monotonic()
+    log.info("Rebuilt user id filter. user_ids=\"%s\", bits=\"%s\"", bloom.count, bloom.size)
+
+async def refresh():
+    global _last_uid, _last_refresh
+    if _filter is None or monotonic() - _last_rebuild >= REBUILD_INTERVAL or _filter.count > _filter.capacity:
+        await rebuild()
+        return
+
+    _last_uid = await _load(_filter, max(0, _last_uid - REFRESH_OVERLAP))
+    _last_refresh = monotonic()
+
+async def _refresh_periodically():
+    global refresh_errors
+    while True:
+        await asyncio.sleep(REFRESH_INTERVAL)
+        try:
+            await refresh()
+        except Exception as e:
+            refresh_errors += 1
+            log.error("Failed to refresh taken user ids: %s", e, exc_info=e)
+
+async def start():
+    global _task, refresh_errors
+    try:
+        await refresh()
+    except Exception as e:
+        # without a filter every check goes to the database
+        refresh_errors += 1
+        log.error("Failed to load taken user ids: %s", e, exc_info=e)
+    _task = asyncio.create_task(_refresh_periodically())
+
+async def stop():
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+
+def stats() -> dict:
+    lookups = checks - filter_negatives
+    return {
+        "checks": checks,
+        "filter_negatives": filter_negatives,
+        "database_lookups": lookups,
+        "false_positives": false_positives,
+        "refresh_errors": refresh_errors,
+        "seconds_since_refresh": round(monotonic() - _last_refresh, 3) if _last_refresh is not None else -1,
+        "filter": _filter.stats() if _filter is not None else {}
+    }
@@ -0,0 +1 @@
+from .bloom_filter import BloomFilter
@@ -0,0 +1,53 @@
+import base64
+import hashlib
+import hmac
+import time
+from functools import lru_cache
+from typing import Optional
+
+from config import config
+
+STATE_TTL = config['security'].get('state_ttl', 600)
+
+
+@lru_cache(maxsize=1)
+def keys() -> dict[str, bytes]:
+    # the first key signs, every listed key verifies, so a new key can be rolled out before the old one is dropped
+    configured = config['security'].get('state_keys')
+    if configured:
+        return {str(key['id']): key['secret'].encode('utf-8') for key in configured}
+
+    # deployments that sign JWTs only with security.jwt_keys have no shared secret to derive a state key from
+    secret = config['security'].get('jwt_secret')
+    if secret is None:
+        raise ValueError("security.state_keys must be configured when security.jwt_secret is not set")
+    return {"0": hmac.new(secret.encode('utf-8'), b"with-oauth-state", hashlib.sha256).digest()}
+
+def _signature(key: bytes, message: str) -> str:
+    return base64.urlsafe_b64encode(hmac.new(key, message.encode('ascii'), hashlib.sha256).digest()).rstrip(b'=').decode('ascii')
+
+def sign(state: str, ttl: int = STATE_TTL) -> str:
+    # <key id>.<expiry>.<state>.<signature>, so any worker holding the keys can check it without shared storage
+    kid, key = next(iter(keys().items()))
+    message = "{}.{}.{}".format(kid, int(time.time()) + ttl, state)
+    return "{}.{}".format(message, _signature(key, message))
+
+def verify(signed: Optional[str], state: Optional[str]) -> bool:
+    if not signed or not state:
+        return False
+
+    message, _, signature = signed.rpartition('.')
+    parts = message.split('.', 2)
+    if len(parts) != 3:
+        return False
+
+    kid, expiry, signed_state = parts
+    key = keys().get(kid)
+    if key is None or not expiry.isdigit():
+        return False
+
+    if not hmac.compare_digest(_signature(key, message), signature):
+        return False
+    if int(expiry) < time.time():
+        return False
+    return hmac.compare_digest(signed_state.encode('utf-8'), state.encode('utf-8'))
@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from typing import Optional
+
+from config import config
+from core.cryptography.brypt import hash_bcrypt, verify_bcrypt
+from core.monitoring import Timing, timed_call
+from core.server import per_worker
+
+log = logging.getLogger(__name__)
+
+queue_wait = Timing()
+hash_time = Timing()
+rejected = 0
+
+_executor: Optional[ProcessPoolExecutor] = None
+_pending = 0
+
+class PasswordEngineBusy(Exception):
+    def __init__(self, pending: int):
+        self.pending = pending
+
+
+def _settings() -> dict:
+    return config["security"].get("password_engine") or {}
+
+def workers() -> int:
+    if _settings().get("workers"):
+        return _settings()["workers"]
+    # bcrypt processes of all server workers together should not outnumber the cores
+    return per_worker(_settings().get("max_workers") or os.cpu_count() or 1)
+
+def queue_depth() -> int:
+    return _settings().get("queue_depth", workers() * 4)
+
+def start():
+    global _executor
+    if _executor is None:
+        log.info("Starting password engine. workers=\"%s\", queue_depth=\"%s\"", workers(), queue_depth())
+        # spawn keeps the workers free of the parent's event loop, sockets and grpc threads
+        _executor = ProcessPoolExecutor(max_workers=workers(), mp_context=multiprocessing.get_context("spawn"))
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        log.info("Shutting down password engine")
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+async def _submit(fn, *args):
+    global _pending, rejected
+    if _pending >= workers() + queue_depth():
+        rejected += 1
+        log.warning("Password engine queue is full. pending=\"%s\"", _pending)
+        raise PasswordEngineBusy(_pending)
+
+    start()
+    _pending += 1
+    submitted = perf_counter()
+    try:
+        result, elapsed = await asyncio.get_running_loop().run_in_executor(_executor, timed_call, fn, *args)
+    finally:
+        _pending -= 1
+
+    hash_time.observe(elapsed)
+    queue_wait.observe(perf_counter() - submitted - elapsed)
+    return result
+
+async def hash_password(password: str) -> str:
+    return await _submit(hash_bcrypt, password)
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await _submit(verify_bcrypt, password, hashed)
+
+def stats() -> dict:
+    return {
+        "workers": workers(),
+        "queue_depth": queue_depth(),
+        "pending": _pending,
+        "rejected": rejected,
+        "queue_wait": queue_wait.snapshot(),
+        "hash_time": hash_time.snapshot()
+    }
@@ -1,12 +1,17 @@
+import json
 import logging
+import secrets
 from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urlencode
 
-from google_auth_oauthlib.flow import Flow
-from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import config
 from core import authentication
 from core import google
+from core import http
 from core import jwt
 from core import user_service
 from core.authentication.auth_methods_service import OAuthMethods
@@ -14,43 +19,77 @@ from models.user import User, Role
 
 log = logging.getLogger(__name__)
 
-flow = Flow.from_client_secrets_file(
-    client_secrets_file=config['auth']['google']['client_secret_file'],
-    scopes=[
-        'https://www.googleapis.com/auth/userinfo.email',
-        'https://www.googleapis.com/auth/userinfo.profile',
-        'openid'
-    ]
-)
-flow.redirect_uri = config['auth']['google']['redirect_uri']
+SCOPES = [
+    'https://www.googleapis.com/auth/userinfo.email',
+    'https://www.googleapis.com/auth/userinfo.profile',
+    'openid'
+]
+
+@lru_cache(maxsize=1)
+def client_secrets() -> dict:
+    with open(config['auth']['google']['client_secret_file'], 'r') as f:
+        secrets_file = json.load(f)
+
+    return secrets_file.get('web') or secrets_file['installed']
 
 def start_authentication():
-    authorization_url, state = flow.authorization_url(
-        access_type='offline',
-        include_granted_scopes='true'
+    state = secrets.token_urlsafe(24)
+    authorization_url = "{auth_uri}?{query}".format(
+        auth_uri=client_secrets()['auth_uri'],
+        query=urlencode({
+            'response_type': 'code',
+            'client_id': client_secrets()['client_id'],
+            'redirect_uri': config['auth']['google']['redirect_uri'],
+            'scope': ' '.join(SCOPES),
+            'state': state,
+            'access_type': 'offline',
+            'include_granted_scopes': 'true'
+        })
     )
 
     return authorization_url, state
 
-def complete_oauth_flow(code: str, db: Session):
+async def exchange_token(code: str) -> str:
+    token_response = await http.request(
+        'google.token',
+        'POST',
+        url=client_secrets()['token_uri'],
+        data={
+            'grant_type': 'authorization_code',
+            'client_id': client_secrets()['client_id'],
+            'client_secret': client_secrets()['client_secret'],
+            'redirect_uri': config['auth']['google']['redirect_uri'],
+            'code': code
+        },
+    )
+
+    if token_response.status_code != 200:
+        raise HTTPException(status_code=token_response.status_code, detail=token_response.text)
+
+    response = token_response.json()
+    if not response.get('access_token'):
+        raise HTTPException(status_code=500, detail="Google provider responded without access token")
+
+    return response.get('access_token')
+
+async def complete_oauth_flow(code: str, db: AsyncSession):
     # fetch user_service info
-    flow.fetch_token(code=code)
-    credentials = flow.credentials
-    google_user = google.user_service.get_user(credentials)
+    access_token = await exchange_token(code)
+    google_user = await google.user_service.get_user(access_token)
 
     # check if user exists
-    user = authentication.auth_methods_service.find_user(google_user.id, OAuthMethods.GOOGLE, db)
+    user = await authentication.auth_methods_service.find_user(google_user.id, OAuthMethods.GOOGLE, db)
 
     if user is None:
-        log.debug("Google user not found. Creating new user. google_id=\"{google_id}\", email=\"{email}\"".format(google_id=google_user.id, email=google_user.email))
+        log.debug("Google user not found. Creating new user. google_id=\"%s\", email=\"%s\"", google_user.id, google_user.email)
         user = User(
             uname = google_user.uname,
             email = google_user.email,
             email_verified = google_user.email_verified
         )
-        user = user_service.add_user(user, OAuthMethods.GOOGLE, {'google_id': google_user.id}, db)
+        user = await user_service.add_user(user, OAuthMethods.GOOGLE, {'google_id': google_user.id}, db)
     else:
-        log.debug("Google user found. google_id=\"{google_id}\", email=\"{email}\"".format(google_id=google_user.id, email=google_user.email))
+        log.debug("Google user found. google_id=\"%s\", email=\"%s\"", google_user.id, google_user.email)
         user.last_login = datetime.now()
 
     jwt_token = jwt.create_token(user.uid, user.role)
@@ -1,5 +1,9 @@
+import hashlib
 import logging
+import threading
+from typing import Optional
 
+from cachetools import TTLCache
 from google.cloud import recaptchaenterprise_v1
 from google.cloud.recaptchaenterprise_v1 import Assessment, Event, CreateAssessmentRequest
 
@@ -7,12 +11,45 @@ from config import config
 
 parant = "projects/with-430118"
 
+# verdicts only cover a client retrying the same request; longer would let one solved token pass many sign-ins
+RECAPTCHA_VERDICT_TTL = config['security']['recaptcha'].get('retry_window', 5)
+RECAPTCHA_TIMEOUT = config['security']['recaptcha'].get('timeout', 5)
+
 log = logging.getLogger(__name__)
 
-def verify_recaptcha(token: str, client_ip: str, action: str):
-    client = recaptchaenterprise_v1.RecaptchaEnterpriseServiceClient()
+_client: Optional[recaptchaenterprise_v1.RecaptchaEnterpriseServiceAsyncClient] = None
+_verdicts = TTLCache(maxsize=config['security']['recaptcha'].get('cache_size', 10000), ttl=RECAPTCHA_VERDICT_TTL)
+_verdicts_lock = threading.Lock()
+cache_hits = 0
+cache_misses = 0
+
+def get_client() -> recaptchaenterprise_v1.RecaptchaEnterpriseServiceAsyncClient:
+    global _client
+    if _client is None:
+        log.info("Creating reCAPTCHA Enterprise client")
+        _client = recaptchaenterprise_v1.RecaptchaEnterpriseServiceAsyncClient()
+    return _client
+
+async def close():
+    global _client
+    if _client is not None:
+        log.info("Closing reCAPTCHA Enterprise client")
+        await _client.transport.close()
+        _client = None
+
+async def verify_recaptcha(token: str, client_ip: str, action: str):
+    global cache_hits, cache_misses
+    verdict_key = (hashlib.sha256(token.encode('utf-8')).digest(), action, client_ip)
 
-    log.debug("Assessing reCAPTCHA. token=\"{}\", client_ip=\"{}\", action=\"{}\"".format(token, client_ip, action))
+    with _verdicts_lock:
+        verdict = _verdicts.get(verdict_key)
+        if verdict is not None:
+            cache_hits += 1
+            log.debug("reCAPTCHA verdict was cached. token=\"%s\", verdict=\"%s\"", token, verdict)
+            return verdict
+        cache_misses += 1
+
+    log.debug("Assessing reCAPTCHA. token=\"%s\", client_ip=\"%s\", action=\"%s\"", token, client_ip, action)
     assessment = Assessment(
         event = Event(
             token = token,
@@ -27,12 +64,24 @@ def verify_recaptcha(token: str, client_ip: str, action: str):
         parent = parant
     )
 
-    response = client.create_assessment(request)
-    log.debug("reCAPTCHA assessment completed. token=\"{token}\"".format(token=token))
+    response = await get_client().create_assessment(request=request, timeout=RECAPTCHA_TIMEOUT)
+    log.debug("reCAPTCHA assessment completed. token=\"%s\"", token)
 
     if response.token_properties.valid and response.risk_analysis.score >= 0.6:
-        log.debug("reCAPTCHA was passed. token=\"{}\"".format(token))
-        return True
+        log.debug("reCAPTCHA was passed. token=\"%s\"", token)
+        verdict = True
     else:
-        log.debug("reCAPTCHA was not passed(score). token=\"{token}\", score=\"{score}\"".format(token=token, score=response.risk_analysis.score))
-        return False
+        log.debug("reCAPTCHA was not passed(score). token=\"%s\", score=\"%s\"", token, response.risk_analysis.score)
+        verdict = False
+
+    with _verdicts_lock:
+        _verdicts[verdict_key] = verdict
+    return verdict
+
+def cache_stats() -> dict:
+    with _verdicts_lock:
+        return {
+            "size": len(_verdicts),
+            "hits": cache_hits,
+            "misses": cache_misses
+        }
@@ -1,23 +1,34 @@
 import logging
 
-from googleapiclient.discovery import build
-
+from core import http
 from models.user import Role
 from schemas.user import GoogleUser
 
+GOOGLE_USER_INFO_URI = "https://www.googleapis.com/oauth2/v2/userinfo"
+
 log = logging.getLogger(__name__)
 
-def get_user(credential) -> GoogleUser:
-    with build(serviceName='oauth2', version='v2', credentials=credential) as service:
-        profile = service.userinfo().get().execute()
+async def get_user(access_token: str) -> GoogleUser:
+    resp = await http.request(
+        'google.user_info',
+        'GET',
+        url=GOOGLE_USER_INFO_URI,
+        headers={
+            'Authorization': 'Bearer {access_token}'.format(access_token=access_token)
+        },
+    )
+
+    if resp.status_code != 200:
+        raise Exception("Failed to fetch user info from Google")
 
-        log.debug("Got user profile from Google. profile=\"{profile}\"".format(profile=profile))
-        google_user = GoogleUser(
-            uname = profile['name'],
-            email = profile['email'],
-            email_verified = profile['verified_email'],
-            id = profile['id'],
-            picture = profile['picture']
-        )
+    profile = resp.json()
+    log.debug("Got user profile from Google. profile=\"%s\"", profile)
+    google_user = GoogleUser(
+        uname = profile['name'],
+        email = profile['email'],
+        email_verified = profile['verified_email'],
+        id = profile['id'],
+        picture = profile['picture']
+    )
 
-        return google_user
\ No newline at end of file
+    return google_user
\ No newline at end of file
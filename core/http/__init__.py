@@ -0,0 +1 @@
+from .client import start, close, get_client, request, stats
@@ -0,0 +1,75 @@
+import logging
+import threading
+from time import perf_counter
+from typing import Optional
+
+import httpx
+
+from config import config
+from core.monitoring import Timing
+
+log = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+_latency: dict[str, Timing] = {}
+_errors: dict[str, int] = {}
+_stats_lock = threading.Lock()
+
+def _settings() -> dict:
+    return config.get('http') or {}
+
+def start():
+    global _client
+    if _client is None:
+        settings = _settings()
+        log.info("Creating shared HTTP client. http2=\"%s\", max_connections=\"%s\"", settings.get('http2', True), settings.get('max_connections', 100))
+        _client = httpx.AsyncClient(
+            http2=settings.get('http2', True),
+            limits=httpx.Limits(
+                max_connections=settings.get('max_connections', 100),
+                max_keepalive_connections=settings.get('max_keepalive_connections', 20),
+                keepalive_expiry=settings.get('keepalive_expiry', 30)
+            ),
+            timeout=httpx.Timeout(
+                settings.get('timeout', 10),
+                connect=settings.get('connect_timeout', 5)
+            )
+        )
+
+async def close():
+    global _client
+    if _client is not None:
+        log.info("Closing shared HTTP client")
+        await _client.aclose()
+        _client = None
+
+def get_client() -> httpx.AsyncClient:
+    start()
+    return _client
+
+def _timing(name: str) -> Timing:
+    timing = _latency.get(name)
+    if timing is None:
+        with _stats_lock:
+            timing = _latency.setdefault(name, Timing())
+    return timing
+
+async def request(name: str, method: str, url: str, **kwargs) -> httpx.Response:
+    started = perf_counter()
+    try:
+        return await get_client().request(method, url, **kwargs)
+    except httpx.HTTPError:
+        with _stats_lock:
+            _errors[name] = _errors.get(name, 0) + 1
+        raise
+    finally:
+        _timing(name).observe(perf_counter() - started)
+
+def stats() -> dict:
+    return {
+        name: {
+            **timing.snapshot(),
+            "errors": _errors.get(name, 0)
+        }
+        for name, timing in list(_latency.items())
+    }
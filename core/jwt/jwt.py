@@ -1,9 +1,15 @@
+import hashlib
+import secrets
+import threading
+import time
 from datetime import datetime, timedelta
 
 import jwt
+from cachetools import TLRUCache
 from jwt import InvalidTokenError
 
 from config import config
+from core.jwt import keys
 from models.user import Role
 
 DB_ROLE_CODE_TO_ROLE = {
@@ -11,6 +17,19 @@ DB_ROLE_CODE_TO_ROLE = {
     Role.ADMIN: ['with:user', 'with:admin']
 }
 
+JWT_CACHE_SIZE = (config['security'].get('jwt_cache') or {}).get('size', 10000)
+JWT_CACHE_TTL = (config['security'].get('jwt_cache') or {}).get('ttl', 300)
+
+# verified claims keyed by sha256 of the token, never kept past the token's own exp
+_verified_tokens = TLRUCache(
+    maxsize=JWT_CACHE_SIZE,
+    ttu=lambda _key, claims, now: min(now + JWT_CACHE_TTL, claims['exp']),
+    timer=time.time
+)
+_verified_tokens_lock = threading.Lock()
+cache_hits = 0
+cache_misses = 0
+
 def create_token(user_id: int, role: Role) -> str:
     payload = {
         'aud': DB_ROLE_CODE_TO_ROLE[role],
@@ -18,53 +37,87 @@ def create_token(user_id: int, role: Role) -> str:
         'exp': datetime.utcnow() + timedelta(weeks=5),
         'iat': datetime.utcnow(),
         'iss': 'with',
+        'jti': secrets.token_urlsafe(16),
     }
 
+    key = keys.signing_key()
+    if key is None:
+        # no asymmetric keys configured yet, keep issuing shared-secret tokens
+        return jwt.encode(
+            payload = payload,
+            key = config['security']['jwt_secret'],
+            algorithm ='HS256',
+        )
+
     return jwt.encode(
         payload = payload,
-        key = config['security']['jwt_secret'],
-        algorithm ='HS256',
+        key = key.private_key,
+        algorithm = key.algorithm,
+        headers = {'kid': key.kid},
     )
 
+def _verification_key(token: str) -> tuple:
+    kid = jwt.get_unverified_header(token).get('kid')
+    if kid is None:
+        # tokens issued before the switch to asymmetric keys carry no kid
+        secret = config['security'].get('jwt_secret')
+        if secret is None:
+            raise InvalidTokenError("Token has no kid")
+        return secret, 'HS256'
+
+    key = keys.verification_key(kid)
+    if key is None:
+        raise InvalidTokenError("Unknown kid")
+    return key.public_key, key.algorithm
+
 def validate_token(token: str) -> bool:
     try:
-        jwt.decode(
-            jwt = token,
-            key = config['security']['jwt_secret'],
-            algorithms = ['HS256'],
-            verify_signature=True,
-            issuer='with',
-            require=['aud', 'exp', 'iat', 'iss'],
-            audience=['with:user', 'with:admin']
-        )
+        decode(token)
     except InvalidTokenError as e:
         return False
 
     return True
 
 def decode(token: str) -> dict:
-    return jwt.decode(
+    global cache_hits, cache_misses
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+
+    with _verified_tokens_lock:
+        claims = _verified_tokens.get(digest)
+        if claims is not None:
+            cache_hits += 1
+            return dict(claims)
+        cache_misses += 1
+
+    key, algorithm = _verification_key(token)
+    claims = jwt.decode(
         jwt = token,
-        key = config['security']['jwt_secret'],
-        algorithms = ['HS256'],
+        key = key,
+        algorithms = [algorithm],
         verify_signature=True,
         issuer='with',
         require=['aud', 'exp', 'iat', 'iss'],
         audience=['with:user', 'with:admin'],
     )
 
+    if JWT_CACHE_SIZE > 0:
+        with _verified_tokens_lock:
+            _verified_tokens[digest] = claims
+    return dict(claims)
+
 def validate_authentication(token: str) -> bool:
     try:
-        jwt.decode(
-            jwt = token,
-            key = config['security']['jwt_secret'],
-            algorithms = ['HS256'],
-            verify_signature=True,
-            issuer='with',
-            require=['aud', 'exp', 'iat', 'iss'],
-            audience=['with:user', 'with:admin'],
-        )
+        decode(token)
     except InvalidTokenError:
         return False
 
-    return True
\ No newline at end of file
+    return True
+
+def cache_stats() -> dict:
+    with _verified_tokens_lock:
+        return {
+            "size": len(_verified_tokens),
+            "max_size": _verified_tokens.maxsize,
+            "hits": cache_hits,
+            "misses": cache_misses
+        }
\ No newline at end of file
@@ -0,0 +1,25 @@
+import argparse
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from core.jwt.keys import ALGORITHMS
+
+def generate_private_key(algorithm: str) -> str:
+    if algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    elif algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        raise ValueError("Unsupported JWT algorithm: {}".format(algorithm))
+
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    ).decode('ascii')
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m core.jwt.keygen", description="Print a new PEM private key for security.jwt_keys.")
+    parser.add_argument("--algorithm", choices=list(ALGORITHMS), default="ES256")
+    print(generate_private_key(parser.parse_args().algorithm), end="")
@@ -0,0 +1,82 @@
+import json
+import logging
+from functools import lru_cache
+from typing import Optional
+
+from cryptography.hazmat.primitives import serialization
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm
+
+from config import config
+
+log = logging.getLogger(__name__)
+
+ALGORITHMS = {
+    "ES256": ECAlgorithm,
+    "EdDSA": OKPAlgorithm,
+}
+
+
+class SigningKey:
+    def __init__(self, kid: str, algorithm: str, private_key=None, public_key=None):
+        if algorithm not in ALGORITHMS:
+            raise ValueError("Unsupported JWT algorithm: {}".format(algorithm))
+        if private_key is None and public_key is None:
+            raise ValueError("JWT key {} has neither a private nor a public key".format(kid))
+
+        self.kid = kid
+        self.algorithm = algorithm
+        self.private_key = private_key
+        self.public_key = public_key or private_key.public_key()
+
+    def jwk(self) -> dict:
+        jwk = ALGORITHMS[self.algorithm].to_jwk(self.public_key, as_dict=True)
+        jwk.update({"kid": self.kid, "alg": self.algorithm, "use": "sig"})
+        return jwk
+
+
+def _read(entry: dict, name: str) -> Optional[bytes]:
+    if entry.get(name):
+        return entry[name].encode('utf-8')
+    if entry.get(name + "_file"):
+        with open(entry[name + "_file"], "rb") as f:
+            return f.read()
+    return None
+
+def _load(entry: dict) -> SigningKey:
+    private_pem = _read(entry, "private_key")
+    public_pem = _read(entry, "public_key")
+    return SigningKey(
+        kid=str(entry['kid']),
+        algorithm=entry.get('algorithm', 'ES256'),
+        private_key=serialization.load_pem_private_key(private_pem, password=None) if private_pem else None,
+        public_key=serialization.load_pem_public_key(public_pem) if public_pem else None
+    )
+
+@lru_cache(maxsize=1)
+def keys() -> dict[str, SigningKey]:
+    # every configured key is published and accepted; retired keys only need their public half
+    return {key.kid: key for key in map(_load, config['security'].get('jwt_keys') or [])}
+
+@lru_cache(maxsize=1)
+def signing_key() -> Optional[SigningKey]:
+    configured = keys()
+    if not configured:
+        return None
+
+    kid = config['security'].get('jwt_signing_kid')
+    if kid is not None:
+        key = configured[str(kid)]
+    else:
+        key = next((key for key in configured.values() if key.private_key is not None), None)
+
+    if key is None or key.private_key is None:
+        raise ValueError("No private key configured to sign JWTs with")
+    log.info("Signing JWTs with key. kid=\"%s\", algorithm=\"%s\"", key.kid, key.algorithm)
+    return key
+
+def verification_key(kid: Optional[str]) -> Optional[SigningKey]:
+    return keys().get(kid) if kid is not None else None
+
+@lru_cache(maxsize=1)
+def jwks() -> bytes:
+    return json.dumps({"keys": [key.jwk() for key in keys().values()]}, separators=(',', ':')).encode('utf-8')
@@ -2,12 +2,12 @@ import random
 import string
 from datetime import datetime
 
-import httpx
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import config
 from core import authentication, kakao
+from core import http
 from core import jwt
 from core import user_service
 from core.authentication.auth_methods_service import OAuthMethods
@@ -28,23 +28,24 @@ def start_authentication():
 
     return authorization_url, state
 
-def exchange_token(code: str):
-    with httpx.Client() as cli:
-        token_response = cli.post(
-            url=config['auth']['kakao']['token_uri'],
-            headers={
-                'Content-Type': 'application/x-www-form-urlencoded;charset=utf-8'
-            },
-            data={
-                'grant_type': 'authorization_code',
-                'client_id': config['auth']['kakao']['client_id'],
-                'redirect_uri': config['auth']['kakao']['redirect_uri'],
-                'code': code,
-                'client_secret': config['auth']['kakao']['client_secret']
-            },
-        )
+async def exchange_token(code: str):
+    token_response = await http.request(
+        'kakao.token',
+        'POST',
+        url=config['auth']['kakao']['token_uri'],
+        headers={
+            'Content-Type': 'application/x-www-form-urlencoded;charset=utf-8'
+        },
+        data={
+            'grant_type': 'authorization_code',
+            'client_id': config['auth']['kakao']['client_id'],
+            'redirect_uri': config['auth']['kakao']['redirect_uri'],
+            'code': code,
+            'client_secret': config['auth']['kakao']['client_secret']
+        },
+    )
 
-    if token_response.status_code is not 200:
+    if token_response.status_code != 200:
         raise HTTPException(status_code=token_response.status_code, detail=token_response.text)
 
     response = token_response.json()
@@ -56,15 +57,15 @@ def exchange_token(code: str):
 
     return response.get('access_token')
 
-def complete_oauth_flow(code: str, db: Session):
+async def complete_oauth_flow(code: str, db: AsyncSession):
     # fetch user_service info
-    access_token = exchange_token(code)
+    access_token = await exchange_token(code)
 
     # fetch user infomation
-    kakao_user = kakao.user_service.get_user(access_token)
+    kakao_user = await kakao.user_service.get_user(access_token)
 
     # check if user exists
-    user = authentication.auth_methods_service.find_user(kakao_user.id, OAuthMethods.GOOGLE, db)
+    user = await authentication.auth_methods_service.find_user(kakao_user.id, OAuthMethods.GOOGLE, db)
 
     if user is None:
         user = User(
@@ -73,7 +74,7 @@ def complete_oauth_flow(code: str, db: Session):
             email_verified = kakao_user.email_verified,
             role = Role.USER.value
         )
-        user = user_service.add_user(user, OAuthMethods.GOOGLE, kakao_user.id, db)
+        user = await user_service.add_user(user, OAuthMethods.GOOGLE, kakao_user.id, db)
     else:
         user.last_login = datetime.now()
 
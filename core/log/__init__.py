@@ -0,0 +1,8 @@
+import logging.config
+
+import yaml
+
+
+def configure(path: str = "log_config.yml"):
+    with open(path, "r") as f:
+        logging.config.dictConfig(yaml.load(f, Loader=yaml.FullLoader))
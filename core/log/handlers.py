@@ -0,0 +1,44 @@
+import atexit
+import os
+import queue
+from logging import LogRecord
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+
+
+class QueueListenerHandler(QueueHandler):
+    def __init__(self, handlers: list, respect_handler_level: bool = True, maxsize: int = 0):
+        super().__init__(queue.Queue(maxsize))
+        # dictConfig only resolves cfg:// references on item access, not on iteration
+        handlers = [handlers[i] for i in range(len(handlers))]
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=respect_handler_level)
+        self.listener.start()
+        atexit.register(self.stop)
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        # records stay in-process, so message formatting is left to the listener thread
+        return record
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def close(self):
+        self.stop()
+        super().close()
+
+
+class SizedTimedRotatingFileHandler(TimedRotatingFileHandler):
+    def __init__(self, filename: str, maxBytes: int = 0, **kwargs):
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        super().__init__(filename, **kwargs)
+        self.maxBytes = maxBytes
+
+    def shouldRollover(self, record: LogRecord) -> int:
+        if super().shouldRollover(record):
+            return 1
+        if self.maxBytes > 0 and self.stream is not None:
+            self.stream.seek(0, 2)
+            if self.stream.tell() >= self.maxBytes:
+                return 1
+        return 0
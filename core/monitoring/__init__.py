@@ -0,0 +1 @@
+from .timing import Timing, timed_call
@@ -0,0 +1,122 @@
+from bisect import bisect_left
+
+# latency buckets in seconds, upper bounds as in Prometheus histograms
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count > 0:
+                lower = BUCKETS[index - 1] if index > 0 else 0.0
+                if index == len(BUCKETS):
+                    return lower
+                return lower + (BUCKETS[index] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return BUCKETS[-1]
+
+
+class RouteMetrics:
+    __slots__ = ("statuses", "latency", "db_latency", "db_statements")
+
+    def __init__(self):
+        self.statuses: dict[int, int] = {}
+        self.latency = Histogram()
+        self.db_latency = Histogram()
+        self.db_statements = 0
+
+
+# only ever touched from the event loop thread, so plain counters are enough
+routes: dict[tuple[str, str], RouteMetrics] = {}
+in_flight = 0
+
+def observe(method: str, route: str, status: int, seconds: float, db_statements: int = 0, db_seconds: float = 0.0):
+    metrics = routes.get((method, route))
+    if metrics is None:
+        metrics = routes[(method, route)] = RouteMetrics()
+
+    metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+    metrics.latency.observe(seconds)
+    metrics.db_latency.observe(db_seconds)
+    metrics.db_statements += db_statements
+
+def _labels(**labels) -> str:
+    return ",".join('{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"')) for key, value in labels.items())
+
+def _render_histogram(name: str, description: str, attribute: str) -> list[str]:
+    lines = [
+        "# HELP {} {}".format(name, description),
+        "# TYPE {} histogram".format(name),
+    ]
+    for (method, route), metrics in list(routes.items()):
+        histogram = getattr(metrics, attribute)
+        cumulative = 0
+        for bound, bucket_count in zip((*BUCKETS, "+Inf"), histogram.counts):
+            cumulative += bucket_count
+            lines.append("{}_bucket{{{}}} {}".format(name, _labels(method=method, route=route, le=bound), cumulative))
+        lines.append("{}_sum{{{}}} {}".format(name, _labels(method=method, route=route), histogram.sum))
+        lines.append("{}_count{{{}}} {}".format(name, _labels(method=method, route=route), histogram.count))
+    return lines
+
+def render_http() -> list[str]:
+    lines = [
+        "# HELP withyou_http_requests_total Requests handled per route and status code",
+        "# TYPE withyou_http_requests_total counter",
+    ]
+    for (method, route), metrics in list(routes.items()):
+        for status, count in list(metrics.statuses.items()):
+            lines.append("withyou_http_requests_total{{{}}} {}".format(_labels(method=method, route=route, status=status), count))
+
+    lines += _render_histogram("withyou_http_request_duration_seconds", "Request latency per route", "latency")
+    lines += _render_histogram("withyou_http_request_db_duration_seconds", "Time spent in database statements per request", "db_latency")
+
+    lines += [
+        "# HELP withyou_http_db_statements_total Database statements executed per route",
+        "# TYPE withyou_http_db_statements_total counter",
+    ]
+    for (method, route), metrics in list(routes.items()):
+        lines.append("withyou_http_db_statements_total{{{}}} {}".format(_labels(method=method, route=route), metrics.db_statements))
+
+    lines += [
+        "# HELP withyou_http_request_duration_quantile_seconds Request latency quantiles estimated from the histogram",
+        "# TYPE withyou_http_request_duration_quantile_seconds gauge",
+    ]
+    for (method, route), metrics in list(routes.items()):
+        for q in QUANTILES:
+            lines.append("withyou_http_request_duration_quantile_seconds{{{}}} {}".format(_labels(method=method, route=route, quantile=q), round(metrics.latency.quantile(q), 6)))
+
+    lines += [
+        "# HELP withyou_http_requests_in_flight Requests currently being handled",
+        "# TYPE withyou_http_requests_in_flight gauge",
+        "withyou_http_requests_in_flight {}".format(in_flight),
+    ]
+    return lines
+
+def render_gauges(prefix: str, stats: dict) -> list[str]:
+    lines = []
+    for key, value in stats.items():
+        name = "{}_{}".format(prefix, key).replace(".", "_").replace("-", "_")
+        if isinstance(value, dict):
+            lines += render_gauges(name, value)
+        elif isinstance(value, (bool, int, float)):
+            lines.append("# TYPE {} gauge".format(name))
+            lines.append("{} {}".format(name, float(value)))
+    return lines
@@ -0,0 +1,32 @@
+import threading
+from time import perf_counter
+
+
+class Timing:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "count": self.count,
+                "total_seconds": round(self.total, 6),
+                "avg_seconds": round(self.total / self.count, 6) if self.count else 0.0,
+                "max_seconds": round(self.max, 6)
+            }
+
+
+def timed_call(fn, *args):
+    started = perf_counter()
+    result = fn(*args)
+    return result, perf_counter() - started
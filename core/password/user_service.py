@@ -3,12 +3,11 @@ from datetime import datetime
 from platform import uname
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.cryptography.brypt import hash_bcrypt, verify_bcrypt
-from models import User
+from core.cryptography import password_engine
 from schemas.user import UserSchema
-from sql.repository import auth_methods_repository, password_method_repository
+from sql.repository import auth_methods_repository, password_method_repository, user_repository
 
 log = logging.getLogger(__name__)
 
@@ -16,24 +15,23 @@ class AuthError(Exception):
     def __init__(self, message: str):
         self.message = message
 
-def authenticate_user(username: str, password: str, db: Session) -> UserSchema:
-    password_method = password_method_repository.get_by_userid(db, username)
-    if password_method is None:
-        log.debug("User not found. username=\"{username}\"".format(username=username))
+async def authenticate_user(username: str, password: str, db: AsyncSession) -> UserSchema:
+    login = await password_method_repository.get_login_by_userid(db, username)
+    if login is None:
+        log.debug("User not found. username=\"%s\"", username)
         raise AuthError("invalid-credentials")
 
-    if not verify_bcrypt(password, password_method.password):
-        log.debug("Password is incorrect. username=\"{username}\"".format(username=username))
+    if not await password_engine.verify_password(password, login.password):
+        log.debug("Password is incorrect. username=\"%s\"", username)
         raise AuthError("invalid-credentials")
 
-    user: User = password_method.auth_methods.user
-    user.last_login = datetime.now()
+    await user_repository.update_last_login(db, login.uid, datetime.now())
 
     return UserSchema(
-        uid=user.uid,
-        uname=user.uname,
-        email=user.email,
-        email_verified=user.email_verified,
-        role=user.role,
-        sex=user.sex
+        uid=login.uid,
+        uname=login.uname,
+        email=login.email,
+        email_verified=login.email_verified,
+        role=login.role,
+        sex=login.sex
     )
@@ -0,0 +1,51 @@
+import importlib
+import logging
+import threading
+from time import perf_counter
+from types import ModuleType
+from typing import Optional
+
+from config import config
+
+log = logging.getLogger(__name__)
+
+# provider modules pull in vendor SDKs (the reCAPTCHA client alone brings grpc and protobuf),
+# so they are imported on first use instead of when the app is imported
+PROVIDERS = {
+    "google.oauth": "core.google.oauth",
+    "google.recaptcha": "core.google.recaptcha",
+    "kakao.oauth": "core.kakao.oauth",
+}
+
+_modules: dict[str, ModuleType] = {}
+_load_seconds: dict[str, float] = {}
+_lock = threading.Lock()
+
+def get(name: str) -> ModuleType:
+    module = _modules.get(name)
+    if module is None:
+        with _lock:
+            module = _modules.get(name)
+            if module is None:
+                started = perf_counter()
+                module = importlib.import_module(PROVIDERS[name])
+                _load_seconds[name] = perf_counter() - started
+                _modules[name] = module
+                log.info("Loaded provider. provider=\"%s\", seconds=\"%.4f\"", name, _load_seconds[name])
+    return module
+
+def loaded(name: str) -> Optional[ModuleType]:
+    return _modules.get(name)
+
+def preload():
+    for name in (config.get('providers') or {}).get('preload') or []:
+        get(name)
+
+def stats() -> dict:
+    return {
+        name: {
+            "loaded": name in _modules,
+            "load_seconds": round(_load_seconds.get(name, 0.0), 6)
+        }
+        for name in PROVIDERS
+    }
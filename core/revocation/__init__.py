@@ -0,0 +1 @@
+from .revocation import is_revoked, remember, remember_revoked, revoke, refresh, start, stop, stats
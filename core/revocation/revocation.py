@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import config
+from core.bloom import BloomFilter
+from sql.database import AsyncSessionLocal
+from sql.repository import revoked_token_repository
+
+log = logging.getLogger(__name__)
+
+
+def _settings() -> dict:
+    return config['security'].get('revocation') or {}
+
+REFRESH_INTERVAL = _settings().get('refresh_interval', 30)
+REBUILD_INTERVAL = _settings().get('rebuild_interval', 3600)
+# revocations are read again for this long after the newest one seen, covering transactions that committed late
+REFRESH_OVERLAP = timedelta(seconds=_settings().get('refresh_overlap', 60))
+BLOOM_CAPACITY = _settings().get('bloom_capacity', 100000)
+BLOOM_ERROR_RATE = _settings().get('bloom_error_rate', 0.001)
+
+# the filter answers "not revoked" without I/O, the exact set settles whatever the filter lets through
+_filter = BloomFilter(BLOOM_CAPACITY, BLOOM_ERROR_RATE)
+_revoked: dict[str, datetime] = {}
+_watermark: Optional[datetime] = None
+_last_refresh: Optional[float] = None
+_last_rebuild: Optional[float] = None
+_task: Optional[asyncio.Task] = None
+
+checks = 0
+filter_positives = 0
+false_positives = 0
+refresh_errors = 0
+
+def is_revoked(jti: Optional[str]) -> bool:
+    global checks, filter_positives, false_positives
+    if jti is None:
+        return False
+
+    checks += 1
+    if jti not in _filter:
+        return False
+
+    filter_positives += 1
+    if jti not in _revoked:
+        false_positives += 1
+        return False
+    return True
+
+def _expires_at(claims: dict) -> datetime:
+    return datetime.utcfromtimestamp(claims['exp'])
+
+def remember(jti: str, expires_at: datetime):
+    if jti not in _revoked:
+        _revoked[jti] = expires_at
+        _filter.add(jti)
+
+async def revoke(db: AsyncSession, claims: dict):
+    # only recorded; the caller remembers it once the commit succeeded, so workers never disagree about it
+    await revoked_token_repository.add(db, claims['jti'], claims['sub'], _expires_at(claims))
+
+def remember_revoked(claims: dict):
+    # takes effect in this worker at once and in the others on their next refresh
+    remember(claims['jti'], _expires_at(claims))
+
+async def rebuild():
+    global _filter, _revoked, _watermark, _last_refresh, _last_rebuild
+    async with AsyncSessionLocal() as db:
+        purged = await revoked_token_repository.delete_expired(db)
+        await db.commit()
+        rows = await revoked_token_repository.get_active(db)
+
+    revoked = {jti: expires_at for jti, expires_at, _ in rows}
+    # keep what this worker revoked while the query was running
+    now = datetime.utcnow()
+    for jti, expires_at in list(_revoked.items()):
+        if expires_at > now:
+            revoked.setdefault(jti, expires_at)
+
+    bloom = BloomFilter(max(BLOOM_CAPACITY, len(revoked) * 2), BLOOM_ERROR_RATE)
+    for jti in revoked:
+        bloom.add(jti)
+
+    _revoked = revoked
+    _filter = bloom
+    _watermark = max((revoked_at for _, _, revoked_at in rows), default=_watermark)
+    _last_refresh = _last_rebuild = monotonic()
+    log.info("Rebuilt revocation filter. revoked=\"%s\", purged=\"%s\", bits=\"%s\"", len(revoked), purged, bloom.size)
+
+async def refresh():
+    global _watermark, _last_refresh
+    if _last_rebuild is None or monotonic() - _last_rebuild >= REBUILD_INTERVAL or _filter.count > _filter.capacity:
+        await rebuild()
+        return
+
+    since = _watermark - REFRESH_OVERLAP if _watermark is not None else datetime.min
+    async with AsyncSessionLocal() as db:
+        rows = await revoked_token_repository.get_revoked_since(db, since)
+
+    for jti, expires_at, revoked_at in rows:
+        remember(jti, expires_at)
+        if _watermark is None or revoked_at > _watermark:
+            _watermark = revoked_at
+    _last_refresh = monotonic()
+
+async def _refresh_periodically():
+    global refresh_errors
+    while True:
+        await asyncio.sleep(REFRESH_INTERVAL)
+        try:
+            await refresh()
+        except Exception as e:
+            refresh_errors += 1
+            log.error("Failed to refresh revoked tokens: %s", e, exc_info=e)
+
+async def start():
+    global _task, refresh_errors
+    try:
+        await refresh()
+    except Exception as e:
+        refresh_errors += 1
+        log.error("Failed to load revoked tokens: %s", e, exc_info=e)
+    _task = asyncio.create_task(_refresh_periodically())
+
+async def stop():
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+
+def stats() -> dict:
+    true_positives = filter_positives - false_positives
+    negatives = checks - true_positives
+    return {
+        "revoked": len(_revoked),
+        "checks": checks,
+        "filter_positives": filter_positives,
+        "false_positives": false_positives,
+        "false_positive_rate": round(false_positives / negatives, 8) if negatives else 0.0,
+        "refresh_errors": refresh_errors,
+        "seconds_since_refresh": round(monotonic() - _last_refresh, 3) if _last_refresh is not None else -1,
+        "filter": _filter.stats()
+    }
@@ -0,0 +1 @@
+from .sizing import WORKERS_ENV, settings, configured_workers, worker_count, per_worker
@@ -0,0 +1,20 @@
+import os
+
+from config import config
+
+# set by the launcher so every worker process knows how many siblings share the machine
+WORKERS_ENV = "WITHYOU_WORKERS"
+
+
+def settings() -> dict:
+    return config.get('server') or {}
+
+def configured_workers() -> int:
+    return max(1, int(settings().get('workers') or os.cpu_count() or 1))
+
+def worker_count() -> int:
+    # a process started without the launcher, e.g. plain `uvicorn main:app`, has the machine to itself
+    return max(1, int(os.environ.get(WORKERS_ENV) or 1))
+
+def per_worker(total: int, minimum: int = 1) -> int:
+    return max(minimum, total // worker_count())
@@ -1 +1 @@
-from .user_service import add_user
\ No newline at end of file
+from .user_service import add_user, add_users, get_principals
@@ -0,0 +1,46 @@
+import threading
+from typing import Optional
+
+from cachetools import TTLCache
+
+from config import config
+from schemas.user import JwtUser
+
+PRINCIPAL_CACHE_SIZE = (config['security'].get('principal_cache') or {}).get('size', 10000)
+PRINCIPAL_CACHE_TTL = (config['security'].get('principal_cache') or {}).get('ttl', 60)
+
+_principals = TTLCache(maxsize=max(PRINCIPAL_CACHE_SIZE, 1), ttl=PRINCIPAL_CACHE_TTL)
+_principals_lock = threading.Lock()
+hits = 0
+misses = 0
+
+def get(uid: int) -> Optional[JwtUser]:
+    global hits, misses
+    with _principals_lock:
+        user = _principals.get(uid)
+        if user is None:
+            misses += 1
+        else:
+            hits += 1
+        return user
+
+def put(user: JwtUser):
+    if PRINCIPAL_CACHE_SIZE <= 0:
+        return
+    with _principals_lock:
+        _principals[user.uid] = user
+
+def invalidate(uid: int):
+    with _principals_lock:
+        _principals.pop(uid, None)
+
+def stats() -> dict:
+    with _principals_lock:
+        lookups = hits + misses
+        return {
+            "size": len(_principals),
+            "max_size": PRINCIPAL_CACHE_SIZE,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+        }
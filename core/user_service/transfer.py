@@ -0,0 +1,204 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Optional
+
+from pydantic import ValidationError
+
+from core.cryptography.brypt import hash_bcrypt
+from models.user import Role
+from schemas.user import UserSchema
+from sql.database import AsyncSessionLocal, async_engine
+from sql.repository import password_method_repository, user_repository
+
+# one user per line, the same format is written by export and read by import:
+# {"id": "...", "name": "...", "email": "...", "sex": "N", "email_verified": false, "role": "USER",
+#  "join_date": "2024-01-01T00:00:00", "last_login": null, "password_hash": "$2b$12$..."}
+# import also takes "password" with the plaintext instead of "password_hash"
+BCRYPT_HASH = re.compile(r'^\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}$')
+
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    timestamp = datetime.fromisoformat(value)
+    # the columns are TIMESTAMP WITHOUT TIME ZONE, an aware value would fail the whole COPY
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+def parse_line(line: str) -> dict:
+    entry = json.loads(line)
+    user = UserSchema(
+        uname=entry["name"],
+        email=entry["email"],
+        email_verified=entry.get("email_verified", False),
+        role=Role(entry.get("role", "USER")),
+        sex=entry.get("sex", "N")
+    )
+
+    userid = entry["id"]
+    if not isinstance(userid, str) or len(userid) < 1 or len(userid) > 255:
+        raise ValueError("Id must be 1 to 255 characters long")
+
+    if entry.get("password_hash") is not None:
+        if not BCRYPT_HASH.match(entry["password_hash"]):
+            raise ValueError("password_hash is not a bcrypt hash")
+        password, hashed = None, entry["password_hash"]
+    elif entry.get("password") is not None:
+        if len(entry["password"]) < 6:
+            raise ValueError("Password must be over 6 characters long")
+        password, hashed = entry["password"], None
+    else:
+        raise ValueError("Either password or password_hash must be given")
+
+    return {
+        "uname": user.uname,
+        "email": user.email,
+        "email_verified": user.email_verified,
+        "role": user.role,
+        "sex": user.sex,
+        "join_date": _timestamp(entry.get("join_date")),
+        "last_login": _timestamp(entry.get("last_login")),
+        "userid": userid,
+        "plaintext": password,
+        "password": hashed
+    }
+
+def export_line(row) -> str:
+    return json.dumps({
+        "id": row.userid,
+        "name": row.uname,
+        "email": row.email,
+        "sex": row.sex,
+        "email_verified": row.email_verified,
+        "role": row.role.value,
+        "join_date": row.join_date.isoformat() if row.join_date is not None else None,
+        "last_login": row.last_login.isoformat() if row.last_login is not None else None,
+        "password_hash": row.password
+    }, ensure_ascii=False, separators=(',', ':')) + "\n"
+
+
+def _batches(lines, first_line: int, batch_size: int):
+    numbered = enumerate(lines, start=1)
+    for _ in islice(numbered, first_line - 1):
+        pass
+    while True:
+        batch = list(islice(numbered, batch_size))
+        if not batch:
+            return
+        yield batch
+
+async def _prepare(batch: list[tuple[int, str]], executor: ProcessPoolExecutor) -> tuple[int, int, list[dict], int]:
+    rows = []
+    rejected = 0
+    for number, line in batch:
+        if not line.strip():
+            continue
+        try:
+            rows.append(parse_line(line))
+        except (ValueError, KeyError, TypeError, ValidationError) as e:
+            rejected += 1
+            print("line {}: rejected: {}".format(number, e), file=sys.stderr)
+
+    # plaintext passwords are hashed on every core; pre-hashed rows skip the pool entirely
+    loop = asyncio.get_running_loop()
+    plaintext = [row for row in rows if row["password"] is None]
+    hashes = await asyncio.gather(*(loop.run_in_executor(executor, hash_bcrypt, row["plaintext"]) for row in plaintext))
+    for row, hashed in zip(plaintext, hashes):
+        row["password"] = hashed
+    for row in rows:
+        del row["plaintext"]
+
+    return batch[0][0], batch[-1][0], rows, rejected
+
+async def _write(rows: list[dict]):
+    async with AsyncSessionLocal() as db:
+        await user_repository.copy_password_users(db, rows)
+        await db.commit()
+
+async def import_users(source, first_line: int, batch_size: int, workers: int) -> int:
+    imported = rejected = 0
+    # spawn keeps the workers free of the parent's event loop and database connections
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        pending = None
+        batches = _batches(source, first_line, batch_size)
+        while True:
+            batch = next(batches, None)
+            # the next batch is hashed while the previous one is copied
+            prepared = asyncio.ensure_future(_prepare(batch, executor)) if batch is not None else None
+
+            if pending is not None:
+                start, end, rows, batch_rejected = await pending
+                rejected += batch_rejected
+                try:
+                    await _write(rows)
+                except Exception as e:
+                    if prepared is not None:
+                        prepared.cancel()
+                    print("lines {}-{}: failed, nothing from them was imported: {}".format(start, end, e), file=sys.stderr)
+                    print("Imported {} users, rejected {}. Fix the input and rerun with --start {}".format(imported, rejected, start), file=sys.stderr)
+                    return 1
+                imported += len(rows)
+                print("Imported {} users (through line {})".format(imported, end), file=sys.stderr)
+
+            if prepared is None:
+                break
+            pending = prepared
+
+    print("Imported {} users, rejected {}".format(imported, rejected), file=sys.stderr)
+    return 1 if rejected else 0
+
+async def export_users(target, after_uid: Optional[int], batch_size: int) -> int:
+    exported = 0
+    async with AsyncSessionLocal() as db:
+        async for rows in user_repository.stream_users(db, password_method_repository.export_listing(after_uid), batch_size):
+            target.write("".join(export_line(row) for row in rows))
+            exported += len(rows)
+    target.flush()
+    print("Exported {} users".format(exported), file=sys.stderr)
+    return 0
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m core.user_service.transfer",
+        description="Bulk import users with password logins using COPY, or export them in the same NDJSON format."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importer = commands.add_parser("import", help="load users from NDJSON, plaintext passwords are hashed on all cores")
+    importer.add_argument("input", help="NDJSON file, - for stdin")
+    importer.add_argument("--start", type=int, default=1, help="first line to read, to resume after a failed batch")
+    importer.add_argument("--batch-size", type=int, default=5000, help="users per COPY and transaction")
+    importer.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="hashing processes")
+
+    exporter = commands.add_parser("export", help="stream users with password logins as NDJSON")
+    exporter.add_argument("output", nargs="?", default="-", help="NDJSON file, - for stdout")
+    exporter.add_argument("--after", type=int, help="only users with a greater uid")
+    exporter.add_argument("--batch-size", type=int, default=5000, help="rows fetched from the server-side cursor at a time")
+
+    return parser.parse_args(argv)
+
+async def run(args) -> int:
+    try:
+        if args.command == "import":
+            with (sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")) as source:
+                return await import_users(source, args.start, args.batch_size, args.workers)
+        with (sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")) as target:
+            return await export_users(target, args.after, args.batch_size)
+    finally:
+        await async_engine.dispose()
+
+def main(argv=None) -> int:
+    return asyncio.run(run(parse_args(argv)))
+
+if __name__ == "__main__":
+    sys.exit(main())
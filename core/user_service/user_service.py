@@ -1,47 +1,88 @@
 import logging
 from datetime import datetime
+from typing import Optional, Union
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.authentication.auth_methods_service import OAuthMethods
-from models import AuthMethods
+from core.user_service import principal_cache
+from models import AuthMethods, GoogleMethod, PasswordMethod
 from models.user import User
-from sql.repository import auth_methods_repository, password_method_repository
-from sql.repository import google_method_repository
+from schemas.user import JwtUser
 from sql.repository import user_repository
 
 log = logging.getLogger(__name__)
 
-def add_user(user: User, auth_method: OAuthMethods, per_oauth_object:dict, db: Session) -> User:
-    user_repository.add(db, user)
-    log.debug("User was added to user table. user_uid=\"{}\"".format(user.uid))
-
+def _auth_rows(auth_method: OAuthMethods, per_oauth_object: dict) -> tuple[AuthMethods, Optional[Union[GoogleMethod, PasswordMethod]]]:
     auth_methods = AuthMethods(
-        uuid=user.uid,
+        uuid=None,
         google=auth_method == OAuthMethods.GOOGLE,
         kakao=auth_method == OAuthMethods.KAKAO,
         password=auth_method == OAuthMethods.PASSWORD
     )
 
-    auth_methods_repository.add(db, auth_methods)
-    log.debug("Auth methods was added to auth_methods table. auth_auid=\"{}\", default_method=\"{default}\"".format(auth_methods.uid, default=str(auth_method)))
-
     if auth_method == OAuthMethods.GOOGLE:
-        google_method_repository.add(db, auth_methods.uid, per_oauth_object['google_id'])
-        log.debug("Google method was added to google_methods table. auth_auid=\"{}\", google_id=\"{}\"".format(auth_methods.uid, per_oauth_object['google_id']))
+        provider_method = GoogleMethod(google_id=per_oauth_object['google_id'])
     elif auth_method == OAuthMethods.KAKAO:
-        pass
+        provider_method = None
     elif auth_method == OAuthMethods.PASSWORD:
-        password_method_repository.add(db, auth_methods.uid, per_oauth_object['user_id'], per_oauth_object['password'])
-        log.debug("Password method was added to password_methods table. auth_auid=\"{}\", id=\"{}\"".format(auth_methods.uid, per_oauth_object['user_id']))
+        provider_method = PasswordMethod(userid=per_oauth_object['user_id'], password=per_oauth_object['password'])
     else:
         raise ValueError("Invalid auth method")
 
+    return auth_methods, provider_method
+
+async def add_user(user: User, auth_method: OAuthMethods, per_oauth_object:dict, db: AsyncSession) -> User:
+    auth_methods, provider_method = _auth_rows(auth_method, per_oauth_object)
+
+    user = await user_repository.add_with_auth_methods(db, user, auth_methods, provider_method)
+    log.debug("User was added with auth methods. user_uid=\"%s\", default_method=\"%s\"", user.uid, auth_method)
+
+    principal_cache.invalidate(user.uid)
     return user
 
+async def add_users(users: list[tuple[User, OAuthMethods, dict]], db: AsyncSession) -> list[User]:
+    entries = [
+        (user, *_auth_rows(auth_method, per_oauth_object))
+        for user, auth_method, per_oauth_object in users
+    ]
+
+    added = await user_repository.add_all_with_auth_methods(db, entries)
+    log.debug("Users were added with auth methods. count=\"%s\"", len(added))
+
+    for user in added:
+        principal_cache.invalidate(user.uid)
+    return added
+
+async def get_principals(db: AsyncSession, uids: list[int]) -> dict[int, JwtUser]:
+    principals = {}
+    missing = []
+    for uid in dict.fromkeys(uids):
+        principal = principal_cache.get(uid)
+        if principal is None:
+            missing.append(uid)
+        else:
+            principals[uid] = principal
+
+    if missing:
+        for user in await user_repository.get_users_by_uids(db, missing):
+            # the rows come from our own database, so the schema validators are skipped
+            principal = JwtUser.model_construct(
+                uid=user.uid,
+                uname=user.uname,
+                email=user.email,
+                email_verified=user.email_verified,
+                role=user.role
+            )
+            principal_cache.put(principal)
+            principals[user.uid] = principal
+
+    log.debug("Principals looked up. requested=\"%s\", from_database=\"%s\", found=\"%s\"", len(uids), len(missing), len(principals))
+    return principals
+
 
-def get_last_login(db: Session, uid: int) -> datetime:
-    user: User = user_repository.get_user_by_uid(db, uid)
-    log.debug("User information queried. uid=\"{}\"".format(user.uid))
+async def get_last_login(db: AsyncSession, uid: int) -> datetime:
+    user: User = await user_repository.get_user_by_uid(db, uid)
+    log.debug("User information queried. uid=\"%s\"", user.uid)
 
     return user.last_login
@@ -0,0 +1,44 @@
+import argparse
+import os
+
+import uvicorn
+
+from core.server import WORKERS_ENV, settings, configured_workers
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the WITH backend with the settings from the server section of the config.")
+    parser.add_argument("--host", help="interface to bind, overrides server.host")
+    parser.add_argument("--port", type=int, help="port to bind, overrides server.port")
+    parser.add_argument("--workers", type=int, help="worker processes, overrides {} and server.workers".format(WORKERS_ENV))
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    server = settings()
+
+    workers = args.workers or int(os.environ.get(WORKERS_ENV) or configured_workers())
+    # workers are spawned, so they inherit this and size their pools and executors from it
+    os.environ[WORKERS_ENV] = str(workers)
+
+    uvicorn.run(
+        "main:app",
+        host=args.host or server.get('host', '0.0.0.0'),
+        port=args.port or server.get('port', 8000),
+        workers=workers,
+        loop=server.get('loop', 'auto'),
+        http=server.get('http', 'auto'),
+        backlog=server.get('backlog', 2048),
+        timeout_keep_alive=server.get('keep_alive', 5),
+        timeout_graceful_shutdown=server.get('graceful_timeout', 30),
+        limit_concurrency=server.get('limit_concurrency'),
+        limit_max_requests=server.get('max_requests'),
+        proxy_headers=server.get('proxy_headers', True),
+        forwarded_allow_ips=server.get('forwarded_allow_ips'),
+        server_header=False,
+        access_log=server.get('access_log', False),
+        log_config=server.get('log_config', 'log_config.yml'),
+    )
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,43 @@
 import logging
-from symbol import pass_stmt
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
 
+from api.admin import admin
 from api.error_handler import add_error_handler
+from api.middleware.metrics import MetricsMiddleware
+from api.system import system
 from api.user import user
+from core import availability, http, providers, revocation
+from core.cryptography import oauth_state, password_engine
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # a missing OAuth state key would otherwise only show up as a 500 on the first sign-in
+    oauth_state.keys()
+    password_engine.start()
+    http.start()
+    providers.preload()
+    await revocation.start()
+    await availability.start()
+    yield
+    await availability.stop()
+    await revocation.stop()
+    await http.close()
+    recaptcha = providers.loaded("google.recaptcha")
+    if recaptcha is not None:
+        await recaptcha.close()
+    password_engine.shutdown()
 
 app = FastAPI(
+    lifespan=lifespan,
     docs_url="/api/docs",
     openapi_url="/api/openapi.json",
     redoc_url="/api/redoc",
 )
 
-from api.authentication import google_signin, authorization, kakao_signin, password_signin
+from api.authentication import google_signin, authorization, jwks, kakao_signin, password_signin, revoke
 
 log = logging.getLogger(__name__)
 
@@ -25,11 +49,24 @@ app.include_router(google_signin.router)
 app.include_router(kakao_signin.router)
 app.include_router(password_signin.router)
 app.include_router(authorization.router)
+app.include_router(jwks.router)
+app.include_router(revoke.router)
 
 # #user
 log.info("Adding user router")
 app.include_router(user.router)
 
+# #admin
+log.info("Adding admin router")
+app.include_router(admin.router)
+
+# #system
+log.info("Adding system router")
+app.include_router(system.router)
+
 add_error_handler(app)
 
+# #middleware
+app.add_middleware(MetricsMiddleware)
+
 log.info("Server ready to go")
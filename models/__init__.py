@@ -2,3 +2,4 @@ from .auth_methods import AuthMethods
 from .google_method import GoogleMethod
 from .password_method import PasswordMethod
 from .user import User
+from .revoked_token import RevokedToken
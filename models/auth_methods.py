@@ -3,6 +3,7 @@ from sqlalchemy.dialects.postgresql import INTEGER, BOOLEAN
 from sqlalchemy.orm import relationship
 
 from sql.database import Base
+from sql.loading import relationship_loading
 
 
 class AuthMethods(Base):
@@ -22,7 +23,7 @@ class AuthMethods(Base):
     kakao = Column(BOOLEAN, nullable=False, default=False)
     password = Column(BOOLEAN, nullable=False, default=False)
 
-    user = relationship("User", back_populates="auth_methods")
+    user = relationship("User", back_populates="auth_methods", lazy=relationship_loading("AuthMethods.user"))
 
-    google_method = relationship("GoogleMethod", back_populates="auth_methods", uselist=False)
-    password_method = relationship("PasswordMethod", back_populates="auth_methods", uselist=False)
+    google_method = relationship("GoogleMethod", back_populates="auth_methods", uselist=False, lazy=relationship_loading("AuthMethods.google_method"))
+    password_method = relationship("PasswordMethod", back_populates="auth_methods", uselist=False, lazy=relationship_loading("AuthMethods.password_method"))
@@ -3,6 +3,7 @@ from sqlalchemy.dialects.postgresql import VARCHAR, INTEGER, TIMESTAMP
 from sqlalchemy.orm import relationship
 
 from sql.database import Base
+from sql.loading import relationship_loading
 
 
 class GoogleMethod(Base):
@@ -11,7 +12,7 @@ class GoogleMethod(Base):
 
     uid = Column(INTEGER, primary_key=True, index=True, unique=True, nullable=False, autoincrement=True)
     auid = Column(INTEGER, ForeignKey("authentication.auth_methods.uid"), nullable=False, unique=True)
-    auth_methods = relationship("AuthMethods", back_populates="google_method")
+    auth_methods = relationship("AuthMethods", back_populates="google_method", lazy=relationship_loading("GoogleMethod.auth_methods"))
 
     google_id = Column(VARCHAR, nullable=False, unique=True)
     last_used = Column(TIMESTAMP)
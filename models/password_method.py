@@ -1,8 +1,9 @@
-from sqlalchemy import Column, ForeignKey
+from sqlalchemy import Column, ForeignKey, func
 from sqlalchemy.dialects.postgresql import VARCHAR, INTEGER, TIMESTAMP, CHAR
 from sqlalchemy.orm import relationship
 
 from sql.database import Base
+from sql.loading import relationship_loading
 
 
 class PasswordMethod(Base):
@@ -11,9 +12,9 @@ class PasswordMethod(Base):
 
     uid = Column(INTEGER, primary_key=True, index=True, unique=True, nullable=False, autoincrement=True)
     auid = Column(INTEGER, ForeignKey("authentication.auth_methods.uid"), nullable=False, unique=True)
-    auth_methods = relationship("AuthMethods", back_populates="password_method")
+    auth_methods = relationship("AuthMethods", back_populates="password_method", lazy=relationship_loading("PasswordMethod.auth_methods"))
 
     userid = Column(VARCHAR, nullable=False, unique=True)
-    password = Column(CHAR, nullable=False)
-    last_changed = Column(TIMESTAMP, nullable=False, default="now()")
+    password = Column(CHAR(60), nullable=False)
+    last_changed = Column(TIMESTAMP, nullable=False, default=func.now())
     last_used = Column(TIMESTAMP)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, ForeignKey, func
+from sqlalchemy.dialects.postgresql import VARCHAR, INTEGER, TIMESTAMP
+
+from sql.database import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+    __table_args__ = {"schema": "authentication"}
+
+    uid = Column(INTEGER, primary_key=True, index=True, unique=True, nullable=False, autoincrement=True)
+    jti = Column(VARCHAR, nullable=False, unique=True)
+    user_uid = Column(INTEGER, ForeignKey("users.users.uid"), nullable=False)
+    expires_at = Column(TIMESTAMP, nullable=False, index=True)
+    revoked_at = Column(TIMESTAMP, nullable=False, default=func.now(), index=True)
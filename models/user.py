@@ -1,11 +1,12 @@
 from enum import Enum
 
 import sqlalchemy.dialects.postgresql
-from sqlalchemy import Column
+from sqlalchemy import Column, func
 from sqlalchemy.dialects.postgresql import TIMESTAMP, INTEGER, VARCHAR, BOOLEAN, CHAR
 from sqlalchemy.orm import relationship
 
 from sql.database import Base
+from sql.loading import relationship_loading
 
 
 class Role(Enum):
@@ -19,7 +20,7 @@ class User(Base):
     uid = Column(INTEGER, primary_key=True, index=True, unique=True, nullable=False, autoincrement=True)
     uname = Column(VARCHAR, nullable=False)
 
-    join_date = Column(TIMESTAMP, nullable=False, default="now()")
+    join_date = Column(TIMESTAMP, nullable=False, default=func.now())
     last_login = Column(TIMESTAMP)
 
     sex = Column(CHAR, nullable=False, default="N")
@@ -27,4 +28,4 @@ class User(Base):
     email_verified = Column(BOOLEAN, nullable=False, default=False)
     role = Column(sqlalchemy.dialects.postgresql.ENUM(Role), nullable=False, default=Role.USER)
 
-    auth_methods = relationship("AuthMethods", back_populates="user", uselist=False)
+    auth_methods = relationship("AuthMethods", back_populates="user", uselist=False, lazy=relationship_loading("User.auth_methods"))
@@ -1,5 +1,9 @@
 from pydantic import BaseModel, field_validator
 
+from config import config
+
+AUTHORIZATION_BATCH_LIMIT = config['security'].get('authorization_batch_limit', 100)
+
 
 class PasswordSignInRequest(BaseModel):
     id: str
@@ -19,3 +23,14 @@ class PasswordSignInRequest(BaseModel):
         if len(value) < 6:
             raise ValueError("Password must be over 6 characters long")
         return value
+
+
+class BatchAuthorizationRequest(BaseModel):
+    tokens: list[str]
+
+    @field_validator("tokens", mode="before")
+    @classmethod
+    def validate_tokens(cls, value):
+        if not isinstance(value, list) or len(value) < 1 or len(value) > AUTHORIZATION_BATCH_LIMIT:
+            raise ValueError("Between 1 and {} tokens must be passed".format(AUTHORIZATION_BATCH_LIMIT))
+        return value
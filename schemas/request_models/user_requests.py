@@ -3,6 +3,10 @@ import re
 from pydantic import field_validator, BaseModel
 from pydantic.v1 import Field
 
+from config import config
+
+USER_LOOKUP_LIMIT = (config.get('user') or {}).get('lookup_limit', 100)
+
 
 class AddUserRequest(BaseModel):
     name: str
@@ -55,3 +59,14 @@ class AddUserRequest(BaseModel):
         if value is None:
             raise ValueError("reCAPTCHA token was not passed")
         return value
+
+
+class UserLookupRequest(BaseModel):
+    uids: list[int]
+
+    @field_validator("uids", mode="before")
+    @classmethod
+    def validate_uids(cls, value):
+        if not isinstance(value, list) or len(value) < 1 or len(value) > USER_LOOKUP_LIMIT:
+            raise ValueError("Between 1 and {} uids must be passed".format(USER_LOOKUP_LIMIT))
+        return value
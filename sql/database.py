@@ -1,8 +1,11 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from config import config
+from sql.instrumentation import instrument
+from sql.pool import engine_options
 
 SQL_DATABASE_URL = "postgresql://{user}:{password}@{host}:{port}/{name}".format(
     host = config["database"]["host"],
@@ -11,11 +14,16 @@ SQL_DATABASE_URL = "postgresql://{user}:{password}@{host}:{port}/{name}".format(
     user = config["database"]["user"],
     password = config["database"]["password"]
 )
+SQL_ASYNC_DATABASE_URL = SQL_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
 
-engine = create_engine(SQL_DATABASE_URL)
+engine = create_engine(SQL_DATABASE_URL, **engine_options(asynchronous=False))
+async_engine = create_async_engine(SQL_ASYNC_DATABASE_URL, **engine_options(asynchronous=True))
+instrument(engine)
+instrument(async_engine.sync_engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=True, bind=engine)
-Base = declarative_base()
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=True, expire_on_commit=False)
+Base = declarative_base(cls=AsyncAttrs)
 
 def create_connection():
     db = SessionLocal()
@@ -23,3 +31,10 @@ def create_connection():
         yield db
     finally:
         db.close()
+
+async def create_async_connection():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def pool_stats() -> dict:
+    return async_engine.pool.stats()
@@ -0,0 +1,78 @@
+import logging
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import config
+
+log = logging.getLogger(__name__)
+
+
+def _settings() -> dict:
+    return config["database"].get("instrumentation") or {}
+
+SLOW_QUERY_SECONDS = _settings().get("slow_query_ms", 200) / 1000
+DEVELOPMENT_MODE = _settings().get("development", config["env"] != "production")
+DEFAULT_STATEMENT_BUDGET = (_settings().get("statement_budget") or {}).get("default", 10)
+ROUTE_STATEMENT_BUDGETS = (_settings().get("statement_budget") or {}).get("routes") or {}
+REPEATED_STATEMENT_LIMIT = _settings().get("repeated_statement_limit", 3)
+
+
+class QueryStats:
+    __slots__ = ("statements", "seconds", "repeated")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+        self.repeated: Optional[dict[str, int]] = {} if DEVELOPMENT_MODE else None
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+def begin() -> QueryStats:
+    stats = QueryStats()
+    _current.set(stats)
+    return stats
+
+def statement_budget(route: str) -> int:
+    return ROUTE_STATEMENT_BUDGETS.get(route, DEFAULT_STATEMENT_BUDGET)
+
+def check_budget(method: str, route: str, stats: QueryStats):
+    if not DEVELOPMENT_MODE:
+        return
+
+    budget = statement_budget(route)
+    if stats.statements > budget:
+        log.warning("Statement budget exceeded. route=\"%s %s\", statements=\"%s\", budget=\"%s\"", method, route, stats.statements, budget)
+
+    for statement, count in stats.repeated.items():
+        if count >= REPEATED_STATEMENT_LIMIT:
+            log.warning("Possible N+1 query. route=\"%s %s\", count=\"%s\", statement=\"%s\"", method, route, count, statement)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = perf_counter() - conn.info["query_started"].pop()
+
+    if elapsed >= SLOW_QUERY_SECONDS:
+        log.warning("Slow query. seconds=\"%.4f\", statement=\"%s\"", elapsed, statement)
+
+    stats = _current.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += elapsed
+        if stats.repeated is not None:
+            stats.repeated[statement] = stats.repeated.get(statement, 0) + 1
+
+def _handle_error(exception_context):
+    if exception_context.connection is not None and exception_context.connection.info.get("query_started"):
+        exception_context.connection.info["query_started"].pop()
+
+def instrument(engine: Engine):
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
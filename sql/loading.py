@@ -0,0 +1,6 @@
+from config import config
+
+
+def relationship_loading(relationship_name: str, default: str = "select") -> str:
+    # e.g. database.relationship_loading: {"PasswordMethod.auth_methods": "raise_on_sql"}
+    return (config["database"].get("relationship_loading") or {}).get(relationship_name, default)
@@ -0,0 +1,85 @@
+from time import perf_counter
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from config import config
+from core.monitoring import Timing
+from core.server import per_worker
+
+
+class _InstrumentedPoolMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait = Timing()
+        self.timeouts = 0
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait.observe(perf_counter() - started)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "timeouts": self.timeouts,
+            "wait": self.wait.snapshot()
+        }
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_settings() -> dict:
+    return config["database"].get("pool") or {}
+
+def pool_sizes() -> tuple[int, int]:
+    settings = pool_settings()
+    size = settings.get("size", 5)
+    max_overflow = settings.get("max_overflow", 10)
+
+    # max_connections is what the database allows for the whole server, split among the worker processes
+    if settings.get("max_connections"):
+        share = per_worker(settings["max_connections"])
+        size = min(size, share)
+        max_overflow = min(max_overflow, share - size)
+
+    return size, max_overflow
+
+def engine_options(asynchronous: bool) -> dict:
+    settings = pool_settings()
+    size, max_overflow = pool_sizes()
+
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if asynchronous else InstrumentedQueuePool,
+        "pool_size": size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.get("timeout", 30),
+        "pool_recycle": settings.get("recycle", 1800),
+        "pool_pre_ping": settings.get("pre_ping", True),
+    }
+
+    # PgBouncer in transaction mode can hand every statement a different server
+    # connection, so asyncpg must not keep named prepared statements around.
+    if asynchronous and settings.get("pgbouncer", False):
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: "__asyncpg_{}__".format(uuid4()),
+        }
+
+    return options
@@ -1,20 +1,37 @@
-from optparse import Option
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
 
 from models.auth_methods import AuthMethods
+from models.google_method import GoogleMethod
+from models.user import User
 
 
-def get_by_userid(db: Session, user_id: int) -> Optional[AuthMethods]:
+async def get_by_userid(db: AsyncSession, user_id: int) -> Optional[AuthMethods]:
     return (
-        db.query(AuthMethods)
-            .filter(
+        await db.scalars(
+            select(AuthMethods)
+            .where(
                 AuthMethods.uuid == user_id
             )
-        .first()
-    )
+        )
+    ).first()
 
-def add(db: Session, auth_methods: AuthMethods):
+async def add(db: AsyncSession, auth_methods: AuthMethods):
     db.add(auth_methods)
-    db.flush()
+    await db.flush()
+
+async def get_by_google_id(db: AsyncSession, google_id: str) -> Optional[AuthMethods]:
+    return (
+        await db.scalars(
+            select(AuthMethods)
+            .join(GoogleMethod, GoogleMethod.auid == AuthMethods.uid)
+            .join(User, User.uid == AuthMethods.uuid)
+            .options(contains_eager(AuthMethods.user))
+            .where(
+                GoogleMethod.google_id == google_id
+            )
+        )
+    ).first()
@@ -1,20 +1,22 @@
-from typing import Union, Optional
+from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.google_method import GoogleMethod
 
 
-def select_by_id(db: Session, google_id: str) -> Optional[GoogleMethod]:
+async def select_by_id(db: AsyncSession, google_id: str) -> Optional[GoogleMethod]:
     return (
-        db.query(GoogleMethod)
-        .filter(
-            GoogleMethod.google_id == google_id
+        await db.scalars(
+            select(GoogleMethod)
+            .where(
+                GoogleMethod.google_id == google_id
+            )
         )
-        .first()
-    )
+    ).first()
 
-def add(db: Session, auid: int, google_id: str):
+async def add(db: AsyncSession, auid: int, google_id: str):
     new_google_method = GoogleMethod(auid=auid, google_id=google_id)
     db.add(new_google_method)
-    db.flush()
+    await db.flush()
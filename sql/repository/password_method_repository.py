@@ -1,30 +1,91 @@
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, Select, exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from models.auth_methods import AuthMethods
 from models.password_method import PasswordMethod
+from models.user import User
 
 
-def exists_by_userid(db: Session, userid: str) -> bool:
+async def exists_by_userid(db: AsyncSession, userid: str) -> bool:
+    # answered from the unique index on userid without loading the row
     return (
-        db.query(PasswordMethod)
-        .filter(
-            PasswordMethod.userid == userid
+        await db.scalar(
+            select(
+                exists()
+                .where(
+                    PasswordMethod.userid == userid
+                )
+            )
         )
-        .first() is not None
     )
 
-def add(db: Session, auid: int, userid: str, password: str):
+async def stream_userids(db: AsyncSession, after_uid: int, batch_size: int):
+    result = await db.stream(
+        select(PasswordMethod.uid, PasswordMethod.userid)
+        .where(
+            PasswordMethod.uid > after_uid
+        )
+        .order_by(PasswordMethod.uid),
+        execution_options={"yield_per": batch_size}
+    )
+    async for rows in result.partitions():
+        yield rows
+
+async def add(db: AsyncSession, auid: int, userid: str, password: str):
     new_password_method = PasswordMethod(auid=auid, userid=userid, password=password)
     db.add(new_password_method)
-    db.flush()
+    await db.flush()
 
-def get_by_userid(db: Session, userid: str) -> Optional[PasswordMethod]:
+async def get_by_userid(db: AsyncSession, userid: str) -> Optional[PasswordMethod]:
     return (
-        db.query(PasswordMethod)
-        .filter(
-            PasswordMethod.userid == userid
+        await db.scalars(
+            select(PasswordMethod)
+            .where(
+                PasswordMethod.userid == userid
+            )
         )
-        .first()
-    )
+    ).first()
 
+async def get_login_by_userid(db: AsyncSession, userid: str) -> Optional[Row]:
+    return (
+        await db.execute(
+            select(
+                PasswordMethod.password,
+                User.uid,
+                User.uname,
+                User.email,
+                User.email_verified,
+                User.role,
+                User.sex
+            )
+            .join(AuthMethods, AuthMethods.uid == PasswordMethod.auid)
+            .join(User, User.uid == AuthMethods.uuid)
+            .where(
+                PasswordMethod.userid == userid
+            )
+        )
+    ).first()
+
+def export_listing(after_uid: Optional[int] = None) -> Select:
+    statement = (
+        select(
+            User.uid,
+            PasswordMethod.userid,
+            PasswordMethod.password,
+            User.uname,
+            User.email,
+            User.email_verified,
+            User.role,
+            User.sex,
+            User.join_date,
+            User.last_login
+        )
+        .join(AuthMethods, AuthMethods.uuid == User.uid)
+        .join(PasswordMethod, PasswordMethod.auid == AuthMethods.uid)
+        .order_by(User.uid)
+    )
+    if after_uid is not None:
+        statement = statement.where(User.uid > after_uid)
+    return statement
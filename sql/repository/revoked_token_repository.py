@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.revoked_token import RevokedToken
+
+
+# expires_at is UTC like the token's exp claim, revoked_at uses the database clock so refresh watermarks stay consistent
+async def add(db: AsyncSession, jti: str, user_uid: int, expires_at: datetime):
+    await db.execute(
+        insert(RevokedToken)
+        .values(jti=jti, user_uid=user_uid, expires_at=expires_at, revoked_at=func.now())
+        # revoking the same token twice is not an error
+        .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+    )
+
+async def get_active(db: AsyncSession) -> list[tuple[str, datetime, datetime]]:
+    return list(
+        await db.execute(
+            select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at)
+            .where(
+                RevokedToken.expires_at > datetime.utcnow()
+            )
+        )
+    )
+
+async def get_revoked_since(db: AsyncSession, since: datetime) -> list[tuple[str, datetime, datetime]]:
+    return list(
+        await db.execute(
+            select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at)
+            .where(
+                RevokedToken.revoked_at >= since,
+                RevokedToken.expires_at > datetime.utcnow()
+            )
+        )
+    )
+
+async def delete_expired(db: AsyncSession) -> int:
+    result = await db.execute(
+        delete(RevokedToken)
+        .where(
+            RevokedToken.expires_at <= datetime.utcnow()
+        )
+    )
+    return result.rowcount
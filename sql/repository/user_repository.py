@@ -1,20 +1,220 @@
-from optparse import Option
+from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, Table, any_, bindparam, insert, literal, select, text, update
+from sqlalchemy.dialects.postgresql import ARRAY, INTEGER
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ClauseElement
 
-from models.user import User
+from models.auth_methods import AuthMethods
+from models.password_method import PasswordMethod
+from models.user import Role, User
 
+LISTED_COLUMNS = (User.uid, User.uname, User.email, User.email_verified, User.role, User.sex, User.join_date, User.last_login)
 
-def get_user_by_uid(db: Session, uid: int) -> Optional[User]:
+
+async def get_user_by_uid(db: AsyncSession, uid: int) -> Optional[User]:
     return (
-        db.query(User)
-            .filter(
+        await db.scalars(
+            select(User)
+            .where(
                 User.uid == uid
             )
-        .first()
+        )
+    ).first()
+
+async def get_users_by_uids(db: AsyncSession, uids: list[int]) -> list[User]:
+    # one array parameter, so the statement text and its prepared plan are the same for any number of uids
+    return list(
+        (
+            await db.scalars(
+                select(User)
+                .where(
+                    User.uid == any_(bindparam("uids", uids, type_=ARRAY(INTEGER)))
+                )
+            )
+        ).all()
     )
 
-def add(db: Session, user: User):
+def _naive_utc(value: datetime) -> datetime:
+    # join_date is TIMESTAMP WITHOUT TIME ZONE, asyncpg refuses to compare it with an aware value
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def listing(
+    after_uid: Optional[int] = None,
+    role: Optional[Role] = None,
+    email_verified: Optional[bool] = None,
+    joined_after: Optional[datetime] = None,
+    joined_before: Optional[datetime] = None
+) -> Select:
+    # keyset pagination, the primary key index seeks straight to after_uid instead of scanning an OFFSET
+    statement = select(*LISTED_COLUMNS).order_by(User.uid)
+    if after_uid is not None:
+        statement = statement.where(User.uid > after_uid)
+    if role is not None:
+        statement = statement.where(User.role == role)
+    if email_verified is not None:
+        statement = statement.where(User.email_verified == email_verified)
+    if joined_after is not None:
+        statement = statement.where(User.join_date >= _naive_utc(joined_after))
+    if joined_before is not None:
+        statement = statement.where(User.join_date < _naive_utc(joined_before))
+    return statement
+
+async def list_users(db: AsyncSession, statement: Select, limit: int) -> list:
+    return list((await db.execute(statement.limit(limit))).all())
+
+async def stream_users(db: AsyncSession, statement: Select, batch_size: int):
+    # plain rows from a server-side cursor, nothing is kept in the identity map, so memory stays flat for any table size
+    result = await db.stream(statement, execution_options={"yield_per": batch_size})
+    async for rows in result.partitions():
+        yield rows
+
+async def add(db: AsyncSession, user: User):
     db.add(user)
-    db.flush()
+    await db.flush()
+
+async def update_last_login(db: AsyncSession, uid: int, last_login: datetime):
+    await db.execute(
+        update(User)
+        .where(
+            User.uid == uid
+        )
+        .values(last_login=last_login)
+    )
+
+def _column_values(entity, exclude: tuple = ("uid",), with_defaults: bool = False) -> dict:
+    values = {}
+    for column in entity.__table__.columns:
+        if column.key in exclude:
+            continue
+
+        value = getattr(entity, column.key)
+        # column defaults only fire for the top-level statement, not for an INSERT nested in a CTE
+        if value is None and with_defaults and column.default is not None:
+            value = column.default.arg
+        if value is not None:
+            values[column.key] = value
+    return values
+
+def _bulk_values(entity) -> dict:
+    # scalar defaults keep the parameter sets homogeneous so they batch into one statement
+    return {
+        key: value
+        for key, value in _column_values(entity, with_defaults=True).items()
+        if not isinstance(value, ClauseElement)
+    }
+
+def _insert_from(parent, parent_key: str, entity):
+    values = _column_values(entity, exclude=("uid", parent_key), with_defaults=True)
+    columns = entity.__table__.columns
+    return (
+        insert(type(entity))
+        .from_select(
+            [parent_key, *values.keys()],
+            select(
+                parent.c.uid,
+                *[
+                    value if isinstance(value, ClauseElement) else literal(value, columns[key].type)
+                    for key, value in values.items()
+                ]
+            )
+        )
+        .returning(type(entity).uid)
+    )
+
+async def add_with_auth_methods(db: AsyncSession, user: User, auth_methods: AuthMethods, provider_method=None) -> User:
+    # users -> auth_methods -> provider row as chained data-modifying CTEs, one round trip
+    new_user = insert(User).values(**_column_values(user, with_defaults=True)).returning(*User.__table__.columns).cte("new_user")
+    new_auth_methods = _insert_from(new_user, "uuid", auth_methods).cte("new_auth_methods")
+
+    ctes = [new_auth_methods]
+    if provider_method is not None:
+        ctes.append(_insert_from(new_auth_methods, "auid", provider_method).cte("new_provider_method"))
+
+    return (
+        await db.scalars(
+            select(User)
+            .from_statement(
+                select(new_user).add_cte(*ctes)
+            )
+        )
+    ).one()
+
+async def add_all_with_auth_methods(db: AsyncSession, entries: list[tuple[User, AuthMethods, Optional[object]]]) -> list[User]:
+    if not entries:
+        return []
+
+    users = (
+        await db.scalars(
+            insert(User).returning(User, sort_by_parameter_order=True),
+            [_bulk_values(user) for user, _, _ in entries]
+        )
+    ).all()
+
+    for user, (_, auth_methods, _) in zip(users, entries):
+        auth_methods.uuid = user.uid
+    auids = (
+        await db.scalars(
+            insert(AuthMethods).returning(AuthMethods.uid, sort_by_parameter_order=True),
+            [_bulk_values(auth_methods) for _, auth_methods, _ in entries]
+        )
+    ).all()
+
+    providers: dict[type, list[dict]] = {}
+    for auid, (_, _, provider_method) in zip(auids, entries):
+        if provider_method is None:
+            continue
+        provider_method.auid = auid
+        providers.setdefault(type(provider_method), []).append(_bulk_values(provider_method))
+
+    for provider_type, rows in providers.items():
+        await db.execute(insert(provider_type), rows)
+
+    return list(users)
+
+async def _reserve_uids(db: AsyncSession, table: Table, count: int) -> list[int]:
+    # COPY does not return generated keys, so the uids are drawn from the serial sequence up front
+    return list(
+        (
+            await db.scalars(
+                text("SELECT nextval(pg_get_serial_sequence(:table, 'uid')) FROM generate_series(1, :count)"),
+                {"table": table.fullname, "count": count}
+            )
+        ).all()
+    )
+
+async def _copy(db: AsyncSession, table: Table, columns: list[str], records: list[tuple]):
+    connection = await (await db.connection()).get_raw_connection()
+    await connection.driver_connection.copy_records_to_table(table.name, schema_name=table.schema, columns=columns, records=records)
+
+async def copy_password_users(db: AsyncSession, rows: list[dict]) -> list[int]:
+    # users -> auth_methods -> password_method with one COPY each, in the caller's transaction
+    if not rows:
+        return []
+
+    now = (await db.execute(text("SELECT LOCALTIMESTAMP"))).scalar_one()
+    uids = await _reserve_uids(db, User.__table__, len(rows))
+    auids = await _reserve_uids(db, AuthMethods.__table__, len(rows))
+
+    await _copy(
+        db, User.__table__,
+        ["uid", "uname", "email", "email_verified", "role", "sex", "join_date", "last_login"],
+        [
+            (uid, row["uname"], row["email"], row["email_verified"], row["role"].value, row["sex"], row["join_date"] or now, row["last_login"])
+            for uid, row in zip(uids, rows)
+        ]
+    )
+    await _copy(
+        db, AuthMethods.__table__,
+        ["uid", "uuid", "google", "kakao", "password"],
+        [(auid, uid, False, False, True) for auid, uid in zip(auids, uids)]
+    )
+    await _copy(
+        db, PasswordMethod.__table__,
+        ["auid", "userid", "password", "last_changed"],
+        [(auid, row["userid"], row["password"], now) for auid, row in zip(auids, rows)]
+    )
+    return uids
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# the config is read lazily from WITHYOU_CONFIG, so this has to be set before anything touches it
+os.environ.setdefault("WITHYOU_CONFIG", os.path.join(os.path.dirname(__file__), "config_test.yml"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
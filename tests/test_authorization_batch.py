@@ -0,0 +1,33 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.authentication import authorization
+from api.error_handler import add_error_handler
+from schemas.request_models.auth_requests import AUTHORIZATION_BATCH_LIMIT
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(authorization.router)
+    add_error_handler(app)
+    return TestClient(app, raise_server_exceptions=False)
+
+@pytest.mark.parametrize("tokens", [None, 5, "token", {"token": "x"}, []])
+def test_batch_rejects_tokens_that_are_not_a_non_empty_list(client, tokens):
+    response = client.post("/api/auth/authorization/batch", json={"tokens": tokens})
+
+    assert response.status_code == 400
+    assert response.json()["code"] == 400
+
+def test_batch_rejects_more_tokens_than_the_limit(client):
+    response = client.post("/api/auth/authorization/batch", json={"tokens": ["x"] * (AUTHORIZATION_BATCH_LIMIT + 1)})
+
+    assert response.status_code == 400
+
+def test_batch_reports_invalid_tokens_per_token(client):
+    response = client.post("/api/auth/authorization/batch", json={"tokens": ["not-a-jwt"]})
+
+    assert response.status_code == 200
+    assert response.json()["results"] == [{"authorized": False}]
@@ -0,0 +1,32 @@
+import pytest
+
+from config import config
+from core.cryptography import oauth_state
+
+
+@pytest.fixture
+def security(monkeypatch):
+    # a fresh security section per test, with the cached keys dropped before and after
+    section = {"jwt_keys": [{"kid": "es-1", "algorithm": "ES256", "private_key_file": "es.pem"}]}
+    monkeypatch.setitem(config.data, "security", section)
+    oauth_state.keys.cache_clear()
+    yield section
+    oauth_state.keys.cache_clear()
+
+def test_jwt_keys_only_config_without_state_keys_fails_clearly(security):
+    with pytest.raises(ValueError, match="security.state_keys"):
+        oauth_state.keys()
+
+def test_jwt_keys_only_config_with_state_keys_signs_and_verifies(security):
+    security["state_keys"] = [{"id": "1", "secret": "state-secret"}]
+
+    signed = oauth_state.sign("abc")
+
+    assert signed.startswith("1.")
+    assert oauth_state.verify(signed, "abc")
+    assert not oauth_state.verify(signed, "abd")
+
+def test_jwt_secret_is_used_when_no_state_keys_are_configured(security):
+    security["jwt_secret"] = "testsecret"
+
+    assert oauth_state.verify(oauth_state.sign("abc"), "abc")
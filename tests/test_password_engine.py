@@ -0,0 +1,28 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.error_handler import add_error_handler
+from core.cryptography import password_engine
+
+
+def test_full_queue_raises_password_engine_busy(monkeypatch):
+    monkeypatch.setattr(password_engine, "_pending", password_engine.workers() + password_engine.queue_depth())
+
+    with pytest.raises(password_engine.PasswordEngineBusy):
+        asyncio.run(password_engine.hash_password("secret1"))
+
+def test_password_engine_busy_is_answered_with_503():
+    app = FastAPI()
+    add_error_handler(app)
+
+    @app.get("/hash")
+    async def busy():
+        raise password_engine.PasswordEngineBusy(pending=8)
+
+    response = TestClient(app, raise_server_exceptions=False).get("/hash")
+
+    assert response.status_code == 503
+    assert response.json() == {"code": 503, "state": "Service Unavailable", "message": "Server is busy, try again later"}
@@ -0,0 +1,22 @@
+import asyncio
+import time
+
+from core import revocation
+from sql.repository import revoked_token_repository
+
+
+def test_revoke_does_not_remember_before_the_commit(monkeypatch):
+    added = []
+
+    async def add(db, jti, user_uid, expires_at):
+        added.append(jti)
+
+    monkeypatch.setattr(revoked_token_repository, "add", add)
+    claims = {"jti": "uncommitted-jti", "sub": 1, "exp": int(time.time()) + 60}
+
+    asyncio.run(revocation.revoke(None, claims))
+    assert added == ["uncommitted-jti"]
+    assert not revocation.is_revoked("uncommitted-jti")
+
+    revocation.remember_revoked(claims)
+    assert revocation.is_revoked("uncommitted-jti")